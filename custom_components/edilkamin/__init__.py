@@ -2,16 +2,36 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 from typing import TYPE_CHECKING
 
+from edilkamin import constants
 from homeassistant.const import Platform
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 
+from custom_components.edilkamin.api.edilkamin_account import EdilkaminAccount
 from custom_components.edilkamin.api.edilkamin_async_api import EdilkaminAsyncApi
-
-from .const import DOMAIN, MAC_ADDRESS, PASSWORD, USERNAME
+from custom_components.edilkamin.api.edilkamin_http_client import EdilkaminHttpClient
+
+from .const import (
+    CONF_BASE_URL,
+    DATA_ACCOUNTS,
+    DATA_API,
+    DATA_COORDINATOR,
+    DOMAIN,
+    MAC_ADDRESS,
+    PASSWORD,
+    PELLET_STORAGE_KEY,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    TOKEN_STORAGE_KEY,
+    USERNAME,
+)
 from .coordinator import EdilkaminCoordinator
+from .statistics import EdilkaminStatistics
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -35,31 +55,143 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     mac_address = entry.data[MAC_ADDRESS]
     username = entry.data[USERNAME]
     password = entry.data[PASSWORD]
+    base_url = get_base_url(entry)
+
+    api = EdilkaminAsyncApi(
+        mac_address=mac_address,
+        username=username,
+        password=password,
+        hass=hass,
+        account=await async_get_account(hass, username, password, base_url),
+    )
+    coordinator = EdilkaminCoordinator(
+        hass,
+        api,
+        options=entry.options,
+        store=get_store(hass, entry),
+        pellet_store=get_store(hass, entry, PELLET_STORAGE_KEY),
+    )
 
-    coordinator = EdilkaminCoordinator(hass, username, password, mac_address)
+    if await coordinator.async_load_stored():
+        # Entities start from the stored state, the cloud can take its time
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"Edilkamin refresh {mac_address}"
+        )
+    else:
+        # First refresh
+        await coordinator.async_refresh()
 
-    # First refresh
-    await coordinator.async_refresh()
+    entry.async_on_unload(api.add_command_listener(coordinator.async_handle_command))
+    entry.async_on_unload(EdilkaminStatistics(hass, coordinator).async_start())
 
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = EdilkaminAsyncApi(
-        mac_address=mac_address, username=username, password=password, hass=hass
-    )
-    hass.data[DOMAIN]["coordinator"] = coordinator
+    hass.data[DOMAIN][entry.entry_id] = {
+        DATA_API: api,
+        DATA_COORDINATOR: coordinator,
+    }
     register_device(hass, entry, mac_address)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        account = entry_data[DATA_API].account
+        # Forget the account once none of its stoves is loaded anymore
+        if not is_account_used(hass, account):
+            accounts = hass.data.get(DATA_ACCOUNTS, {})
+            if accounts.get(account.username) is account:
+                accounts.pop(account.username)
+            account.disable_renewal()
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data of a deleted entry.
+
+    The token is only removed with the last entry of the account.
+    """
+    await get_store(hass, entry).async_remove()
+    await get_store(hass, entry, PELLET_STORAGE_KEY).async_remove()
+    username = entry.data[USERNAME]
+    base_url = get_base_url(entry)
+    if not any(
+        other.data.get(USERNAME) == username and get_base_url(other) == base_url
+        for other in hass.config_entries.async_entries(DOMAIN)
+        if other.entry_id != entry.entry_id
+    ):
+        await get_token_store(hass, username, base_url).async_remove()
+
+
+def get_store(hass: HomeAssistant, entry: ConfigEntry, key: str = STORAGE_KEY) -> Store:
+    """Return a store of an entry, by default its last device information."""
+    return Store(hass, STORAGE_VERSION, f"{key}.{entry.entry_id}")
+
+
+def get_base_url(entry: ConfigEntry) -> str:
+    """Return the base URL of the API used by an entry."""
+    return entry.options.get(CONF_BASE_URL) or constants.NEW_API_URL
+
+
+def get_token_store(
+    hass: HomeAssistant, username: str, base_url: str = constants.NEW_API_URL
+) -> Store:
+    """Return the store of the token of an account, at the API of base_url.
+
+    Each API has its own store, a token of one is rejected by the other.
+    """
+    key = username if base_url == constants.NEW_API_URL else f"{base_url} {username}"
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return Store(hass, STORAGE_VERSION, f"{TOKEN_STORAGE_KEY}.{digest}", private=True)
+
+
+async def async_get_account(
+    hass: HomeAssistant,
+    username: str,
+    password: str,
+    base_url: str = constants.NEW_API_URL,
+) -> EdilkaminAccount:
+    """Return the account shared by the stoves of username."""
+    accounts: dict[str, EdilkaminAccount] = hass.data.setdefault(DATA_ACCOUNTS, {})
+    account = accounts.get(username)
+    if (
+        account is None
+        or account.password != password
+        or account.client.base_url != base_url
+    ):
+        # The entries still loaded keep the account they use
+        if account is not None and not is_account_used(hass, account):
+            account.disable_renewal()
+        account = EdilkaminAccount(
+            hass,
+            username,
+            password,
+            client=EdilkaminHttpClient(async_get_clientsession(hass), base_url),
+            store=get_token_store(hass, username, base_url),
+        )
+        accounts[username] = account
+        await account.async_load_token()
+        account.enable_renewal()
+    return account
+
+
+def is_account_used(hass: HomeAssistant, account: EdilkaminAccount) -> bool:
+    """Return whether a loaded entry uses the account."""
+    return any(
+        data[DATA_API].account is account for data in hass.data.get(DOMAIN, {}).values()
+    )
+
+
 def register_device(hass: HomeAssistant, config_entry, mac_address):
     """Register a device in the Home Assistant device registry."""
     device_registry = dr.async_get(hass)
@@ -0,0 +1,167 @@
+"""Circuit breaker holding back requests while the Edilkamin cloud is down."""
+
+from __future__ import annotations
+
+from enum import StrEnum
+import logging
+import random
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+from .exceptions import CircuitOpenError, HttpError
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+# Consecutive failures opening the circuit
+FAILURE_THRESHOLD = 3
+# Time the circuit stays open, doubled each time the probe fails
+BASE_OPEN_DELAY = 5.0
+MAX_OPEN_DELAY = 600.0
+# Random part of the delay, so stoves do not all probe at the same time
+OPEN_DELAY_JITTER = 0.2
+
+HTTP_TOO_MANY_REQUESTS = 429
+HTTP_SERVER_ERROR = 500
+
+
+class CircuitState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def is_outage(err: BaseException) -> bool:
+    """Check if the error comes from the cloud being unavailable.
+
+    Errors of the request itself, like an unknown command, do not count.
+    """
+    if isinstance(err, HttpError):
+        return (
+            err.status_code == HTTP_TOO_MANY_REQUESTS
+            or err.status_code >= HTTP_SERVER_ERROR
+        )
+    return isinstance(err, (aiohttp.ClientError, TimeoutError))
+
+
+class CircuitBreaker:
+    """Stop sending requests after repeated failures.
+
+    After FAILURE_THRESHOLD consecutive outage errors the circuit opens:
+    requests fail right away with CircuitOpenError. Once the delay elapsed,
+    a single request probes the cloud (half open): its success closes the
+    circuit, its failure opens it again for twice as long. Errors that are
+    not outages neither count as failures nor close the circuit: if the
+    probe fails with one, the circuit opens again for as long as before.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        base_delay: float = BASE_OPEN_DELAY,
+        max_delay: float = MAX_OPEN_DELAY,
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self._name = name
+        self._failure_threshold = failure_threshold
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._probing = False
+        self._rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the state of the circuit."""
+        return self._state
+
+    @property
+    def failures(self) -> int:
+        """Return the number of consecutive failures."""
+        return self._failures
+
+    @property
+    def rejected(self) -> int:
+        """Return the number of requests held back."""
+        return self._rejected
+
+    async def async_call[T](self, func: Callable[..., Awaitable[T]], *args: Any) -> T:
+        """Call func, unless the circuit is open."""
+        probe = self._before_call()
+        try:
+            result = await func(*args)
+        except Exception as err:
+            if is_outage(err):
+                self._record_failure()
+            elif probe:
+                # The cloud answered, but its availability is still unknown
+                self._open()
+            raise
+        finally:
+            if probe:
+                self._probing = False
+        self._record_success()
+        return result
+
+    def _before_call(self) -> bool:
+        """Raise CircuitOpenError if the request must be held back.
+
+        Return whether the request probes the cloud.
+        """
+        if self._state is CircuitState.CLOSED:
+            return False
+        now = monotonic()
+        if self._state is CircuitState.OPEN:
+            if now < self._open_until:
+                self._rejected += 1
+                raise CircuitOpenError(self._open_until - now)
+            _LOGGER.debug("%s: probing the cloud", self._name)
+            self._state = CircuitState.HALF_OPEN
+        if self._probing:
+            # Only one request probes the cloud, the others wait for it
+            self._rejected += 1
+            raise CircuitOpenError(0)
+        self._probing = True
+        return True
+
+    def _record_success(self) -> None:
+        """Close the circuit."""
+        if self._state is not CircuitState.CLOSED:
+            _LOGGER.info("%s: the cloud is available again", self._name)
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._trips = 0
+
+    def _record_failure(self) -> None:
+        """Count the failure, and open the circuit when there are too many."""
+        self._failures += 1
+        if (
+            self._state is CircuitState.CLOSED
+            and self._failures < self._failure_threshold
+        ):
+            return
+        self._trips += 1
+        self._open()
+
+    def _open(self) -> None:
+        """Open the circuit, for longer at each trip."""
+        delay = min(self._base_delay * 2 ** (self._trips - 1), self._max_delay)
+        delay *= random.uniform(1 - OPEN_DELAY_JITTER, 1 + OPEN_DELAY_JITTER)  # noqa: S311
+        self._state = CircuitState.OPEN
+        self._open_until = monotonic() + delay
+        _LOGGER.warning(
+            "%s: the cloud is unavailable, holding requests back for %.0f seconds",
+            self._name,
+            delay,
+        )
@@ -0,0 +1,87 @@
+"""Cognito authentication of the Edilkamin accounts."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, NamedTuple
+
+from edilkamin import constants
+from pycognito import Cognito
+
+from .edilkamin_http_client import REQUEST_TIMEOUT
+from .exceptions import HttpError
+
+if TYPE_CHECKING:
+    import aiohttp
+
+# The user pool id starts with its region
+COGNITO_URL = (
+    f"https://cognito-idp.{constants.USER_POOL_ID.split('_')[0]}.amazonaws.com/"
+)
+
+
+class CognitoTokens(NamedTuple):
+    """Tokens of a sign in."""
+
+    id_token: str
+    refresh_token: str | None = None
+
+
+def sign_in(username: str, password: str) -> CognitoTokens:
+    """Sign in with the username and password (SRP), this call is blocking."""
+    cognito = Cognito(constants.USER_POOL_ID, constants.CLIENT_ID, username=username)
+    cognito.authenticate(password)
+    return CognitoTokens(cognito.id_token, cognito.refresh_token)
+
+
+async def async_sign_in(
+    session: aiohttp.ClientSession, username: str, password: str, url: str
+) -> CognitoTokens:
+    """Sign in with the username and password, sent as is.
+
+    Only for the authentication APIs standing in for Cognito, the
+    Edilkamin user pool requires the SRP exchange of sign_in.
+    """
+    result = await _async_initiate_auth(
+        session,
+        url,
+        "USER_PASSWORD_AUTH",
+        {"USERNAME": username, "PASSWORD": password},
+    )
+    return CognitoTokens(result["IdToken"], result.get("RefreshToken"))
+
+
+async def async_refresh(
+    session: aiohttp.ClientSession, refresh_token: str, url: str = COGNITO_URL
+) -> str:
+    """Get a new id token with the refresh token, without the password."""
+    result = await _async_initiate_auth(
+        session, url, "REFRESH_TOKEN_AUTH", {"REFRESH_TOKEN": refresh_token}
+    )
+    return result["IdToken"]
+
+
+async def _async_initiate_auth(
+    session: aiohttp.ClientSession, url: str, flow: str, parameters: dict
+) -> dict:
+    """Run an InitiateAuth flow and return its authentication result."""
+    body = {
+        "AuthFlow": flow,
+        "ClientId": constants.CLIENT_ID,
+        "AuthParameters": parameters,
+    }
+    async with session.post(
+        url,
+        data=json.dumps(body),
+        headers={
+            "Content-Type": "application/x-amz-json-1.1",
+            "X-Amz-Target": "AWSCognitoIdentityProviderService.InitiateAuth",
+        },
+        timeout=REQUEST_TIMEOUT,
+    ) as response:
+        if response.status >= 400:
+            text = await response.text()
+            msg = f"{flow} failed with status {response.status}"
+            raise HttpError(msg, text, response.status)
+        data = await response.json(content_type=None)
+    return data["AuthenticationResult"]
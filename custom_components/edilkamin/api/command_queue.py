@@ -0,0 +1,142 @@
+"""Per device queue merging and serializing the commands sent to the stove."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Time to wait for more commands before sending the queued ones
+COMMAND_COALESCE_WINDOW = 0.2
+
+
+@dataclass
+class _QueuedCommand:
+    """A command waiting to be sent, and the callers waiting for it."""
+
+    payload: dict
+    queued_at: float
+    futures: list[asyncio.Future] = field(default_factory=list)
+
+
+@dataclass
+class CommandQueueStats:
+    """Statistics of a command queue."""
+
+    queued: int = 0
+    sent: int = 0
+    merged: int = 0
+    failed: int = 0
+    last_latency: float | None = None
+    total_latency: float = 0.0
+
+    @property
+    def average_latency(self) -> float | None:
+        """Return the average time between queuing and sending a command."""
+        if not self.sent:
+            return None
+        return self.total_latency / self.sent
+
+
+class CommandQueue:
+    """Send the commands of a device one at a time, in order.
+
+    Commands are held for a short window. A command for a parameter that
+    is already queued replaces it (last value wins) and moves to the end
+    of the queue, so dragging a slider only sends the final value.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        send: Callable[[dict], Awaitable[Any]],
+        name: str,
+        window: float = COMMAND_COALESCE_WINDOW,
+    ) -> None:
+        """Initialize the queue."""
+        self._hass = hass
+        self._send = send
+        self._name = name
+        self._window = window
+        self._queue: dict[str, _QueuedCommand] = {}
+        self._flush_task: asyncio.Task | None = None
+        self.stats = CommandQueueStats()
+
+    @property
+    def depth(self) -> int:
+        """Return the number of commands waiting to be sent."""
+        return len(self._queue)
+
+    async def async_put(self, payload: dict) -> Any:
+        """Queue the command and return the result once it was sent."""
+        future = asyncio.get_running_loop().create_future()
+        name = payload["name"]
+
+        self.stats.queued += 1
+        queued = self._queue.pop(name, None)
+        if queued is None:
+            queued = _QueuedCommand(payload, monotonic())
+        else:
+            _LOGGER.debug("Merging command %s into the queued one", name)
+            self.stats.merged += 1
+            queued.payload = payload
+        queued.futures.append(future)
+        self._queue[name] = queued
+
+        if self._flush_task is None:
+            self._flush_task = self._hass.async_create_background_task(
+                self._async_flush(), f"{self._name} command queue"
+            )
+        return await future
+
+    async def _async_flush(self) -> None:
+        """Send the queued commands, including the ones added meanwhile.
+
+        If the flush is cancelled, the callers of the command being sent
+        and of the queued ones are cancelled too.
+        """
+        in_flight: _QueuedCommand | None = None
+        try:
+            await asyncio.sleep(self._window)
+            while self._queue:
+                name = next(iter(self._queue))
+                in_flight = self._queue.pop(name)
+                await self._async_send(in_flight)
+                in_flight = None
+        finally:
+            self._flush_task = None
+            pending = list(self._queue.values())
+            if in_flight is not None:
+                pending.append(in_flight)
+            for command in pending:
+                for future in command.futures:
+                    future.cancel()
+            self._queue.clear()
+
+    async def _async_send(self, command: _QueuedCommand) -> None:
+        """Send a single command and resolve its waiters."""
+        try:
+            result = await self._send(command.payload)
+        except Exception as err:  # noqa: BLE001
+            self.stats.failed += 1
+            for future in command.futures:
+                if not future.done():
+                    future.set_exception(err)
+            return
+
+        latency = monotonic() - command.queued_at
+        self.stats.sent += 1
+        self.stats.last_latency = latency
+        self.stats.total_latency += latency
+        for future in command.futures:
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,295 @@
+"""Edilkamin cloud account, shared by all the stoves it owns."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+import logging
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later
+import jwt
+
+from . import cognito
+from .edilkamin_http_client import EdilkaminHttpClient
+from .exceptions import HttpError
+from .metrics import Metrics
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.storage import Store
+
+_LOGGER = logging.getLogger(__name__)
+
+# Renew the token this long before it actually expires
+TOKEN_EXPIRATION_MARGIN = timedelta(seconds=60)
+# Renew the token in the background this long before it expires
+TOKEN_RENEWAL_LEAD = timedelta(minutes=5)
+# Never renew in the background sooner than this, in seconds, so a short
+# lived token or a skewed clock does not renew it in a loop
+MIN_RENEWAL_DELAY = 30
+# Longest wait, in seconds, before retrying a failed background renewal
+MAX_RENEWAL_RETRY_DELAY = 1800
+# Status of a request whose token was rejected
+HTTP_UNAUTHORIZED = 401
+
+
+def token_expiration(token: str) -> datetime | None:
+    """Return the expiration date of the token, None if it has none."""
+    try:
+        exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+    except jwt.PyJWTError:
+        return None
+    return None if exp is None else datetime.fromtimestamp(exp, tz=UTC)
+
+
+def is_token_expired(token: str) -> bool:
+    """Check if the token is expired, or about to expire."""
+    try:
+        payload = jwt.decode(token, options={"verify_signature": False})
+        exp = payload.get("exp")
+        if exp is None:
+            return True
+        exp_date = datetime.fromtimestamp(exp, tz=UTC)
+        return exp_date < datetime.now(tz=UTC) + TOKEN_EXPIRATION_MARGIN
+    except (jwt.PyJWTError, KeyError):
+        return True
+    except Exception:  # noqa: BLE001
+        return True
+
+
+class EdilkaminAccount:
+    """Hold the authentication and the HTTP client of an account.
+
+    Every stove of the account uses the same token, so adding a stove does
+    not add sign ins, and device fetches are serialized so several stoves
+    polled at the same time do not burst the cloud.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        username: str,
+        password: str,
+        client: EdilkaminHttpClient | None = None,
+        store: Store | None = None,
+    ) -> None:
+        """Initialize the account.
+
+        The token is saved to store, when given, to be reused after a restart.
+        """
+        self._hass = hass
+        self._username = username
+        self._password = password
+        self._client = client
+        self._store = store
+
+        self._metrics = Metrics()
+        self._token: str | None = None
+        self._refresh_token: str | None = None
+        self._unsub_renewal: Callable[[], None] | None = None
+        self._renew_ahead = False
+        self._renewal_failures = 0
+        self._token_lock = asyncio.Lock()
+        self._fetch_lock = asyncio.Lock()
+
+    @property
+    def username(self) -> str:
+        """Return the username of the account."""
+        return self._username
+
+    @property
+    def password(self) -> str:
+        """Return the password of the account."""
+        return self._password
+
+    @property
+    def metrics(self) -> Metrics:
+        """Return the metrics of the sign ins and token refreshes."""
+        return self._metrics
+
+    @property
+    def client(self) -> EdilkaminHttpClient:
+        """Return the HTTP client, bound to the shared Home Assistant session."""
+        if self._client is None:
+            self._client = EdilkaminHttpClient(async_get_clientsession(self._hass))
+        return self._client
+
+    @property
+    def cognito_url(self) -> str | None:
+        """Return the URL of the authentication API, None for Cognito."""
+        return None if self._client is None else self._client.cognito_url
+
+    async def async_load_token(self) -> None:
+        """Restore the tokens saved by a previous run.
+
+        The token is only reused if it is still valid, the refresh token
+        renews it otherwise.
+        """
+        if self._store is None or not (data := await self._store.async_load()):
+            return
+        if self._token is not None:
+            return
+        token = data.get("token")
+        if token is not None and not is_token_expired(token):
+            _LOGGER.debug("Restored the token of %s", self._username)
+            self._token = token
+        self._refresh_token = data.get("refresh_token")
+
+    def _tokens_to_save(self) -> dict:
+        """Return the tokens, when the store writes them."""
+        return {"token": self._token, "refresh_token": self._refresh_token}
+
+    async def sign_in(self) -> str:
+        """Sign in with the username and password."""
+        with self._metrics.measure("sign_in"):
+            if (url := self.cognito_url) is None:
+                tokens = await self._hass.async_add_executor_job(
+                    cognito.sign_in, self._username, self._password
+                )
+            else:
+                tokens = await cognito.async_sign_in(
+                    self.client.session, self._username, self._password, url
+                )
+        self._refresh_token = tokens.refresh_token
+        self._set_token(tokens.id_token)
+        return tokens.id_token
+
+    async def get_token(self) -> str:
+        """Return a valid token, renewing it only when the cached one expired.
+
+        Concurrent callers wait on the same renewal instead of each
+        starting their own.
+        """
+        token = self._token
+        if token is not None and not is_token_expired(token):
+            return token
+
+        async with self._token_lock:
+            # Another caller may have refreshed the token while we waited
+            if self._token is None or is_token_expired(self._token):
+                _LOGGER.debug("Token is expired or None, renewing it")
+                await self._renew_token()
+            return self._token
+
+    async def _renew_token(self) -> None:
+        """Renew the token with the refresh token, or sign in again."""
+        if self._refresh_token is not None:
+            try:
+                with self._metrics.measure("token_refresh"):
+                    token = await cognito.async_refresh(
+                        self.client.session,
+                        self._refresh_token,
+                        self.cognito_url or cognito.COGNITO_URL,
+                    )
+            except (HttpError, aiohttp.ClientError, TimeoutError, KeyError) as err:
+                _LOGGER.debug("Token refresh failed, signing in again: %s", err)
+                self._refresh_token = None
+            else:
+                self._set_token(token)
+                return
+        await self.sign_in()
+
+    def _set_token(self, token: str) -> None:
+        """Use a new token: save it and plan its renewal."""
+        self._token = token
+        if self._store is not None:
+            self._store.async_delay_save(self._tokens_to_save)
+        self._schedule_renewal()
+
+    def enable_renewal(self) -> None:
+        """Renew the token in the background, before it expires.
+
+        Polls and commands then never wait on the authentication.
+        """
+        self._renew_ahead = True
+        self._schedule_renewal()
+
+    def disable_renewal(self) -> None:
+        """Stop renewing the token in the background."""
+        self._renew_ahead = False
+        if self._unsub_renewal is not None:
+            self._unsub_renewal()
+            self._unsub_renewal = None
+
+    def _schedule_renewal(self, delay: float | None = None) -> None:
+        """Plan the renewal of the current token.
+
+        By default it is renewed a bit before it expires, and in any case
+        not sooner than MIN_RENEWAL_DELAY.
+        """
+        if not self._renew_ahead or self._token is None:
+            return
+        if self._unsub_renewal is not None:
+            self._unsub_renewal()
+            self._unsub_renewal = None
+        if delay is None:
+            if (expiration := token_expiration(self._token)) is None:
+                return
+            lead = expiration - datetime.now(tz=UTC) - TOKEN_RENEWAL_LEAD
+            delay = lead.total_seconds()
+        self._unsub_renewal = async_call_later(
+            self._hass, max(delay, MIN_RENEWAL_DELAY), self._async_renew_ahead
+        )
+
+    async def _async_renew_ahead(self, _now: datetime) -> None:
+        """Renew the token before it expires, retry with a backoff if it fails."""
+        self._unsub_renewal = None
+        async with self._token_lock:
+            try:
+                await self._renew_token()
+            except Exception:  # noqa: BLE001
+                # Meanwhile, the next request renews it if it expires
+                self._renewal_failures += 1
+                retry_in = min(
+                    MIN_RENEWAL_DELAY * 2**self._renewal_failures,
+                    MAX_RENEWAL_RETRY_DELAY,
+                )
+                _LOGGER.warning(
+                    "Could not renew the token of %s, retrying in %s s",
+                    self._username,
+                    retry_in,
+                )
+                self._schedule_renewal(retry_in)
+            else:
+                self._renewal_failures = 0
+
+    async def _async_drop_token(self, token: str) -> None:
+        """Forget a token rejected by the cloud, and its saved copy.
+
+        The refresh token goes with it, so the next token comes from a new
+        sign in.
+        """
+        async with self._token_lock:
+            # Another caller may have dropped or renewed it already
+            if self._token != token:
+                return
+            _LOGGER.debug("The token of %s was rejected, dropping it", self._username)
+            self._token = None
+            self._refresh_token = None
+            if self._store is not None:
+                await self._store.async_remove()
+
+    async def _request(self, request: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """Send a request with the token, once more with a new one if rejected."""
+        token = await self.get_token()
+        try:
+            return await request(token, *args)
+        except HttpError as err:
+            if err.status_code != HTTP_UNAUTHORIZED:
+                raise
+            await self._async_drop_token(token)
+        return await request(await self.get_token(), *args)
+
+    async def device_info(self, mac_address: str) -> dict:
+        """Get the information of a device, one device of the account at a time."""
+        async with self._fetch_lock:
+            return await self._request(self.client.device_info, mac_address)
+
+    async def mqtt_command(self, mac_address: str, payload: dict) -> str:
+        """Send a command to a device of the account."""
+        return await self._request(self.client.mqtt_command, mac_address, payload)
@@ -1,8 +1,27 @@
+from collections.abc import Callable
 import logging
 
-import edilkamin
 from homeassistant.core import HomeAssistant
 
+from .circuit_breaker import CircuitBreaker
+from .command_queue import CommandQueue
+from .edilkamin_account import EdilkaminAccount
+from .exceptions import (
+    CircuitOpenError,
+    EdilkaminApiError,
+    HttpError,
+    NotInRightStateError,
+)
+from .metrics import Metrics
+
+__all__ = [
+    "CircuitOpenError",
+    "EdilkaminApiError",
+    "EdilkaminAsyncApi",
+    "HttpError",
+    "NotInRightStateError",
+]
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -10,13 +29,53 @@ class EdilkaminAsyncApi:
     """Class to interact with the Edilkamin API."""
 
     def __init__(
-        self, mac_address, username: str, password: str, hass: HomeAssistant
+        self,
+        mac_address,
+        username: str,
+        password: str,
+        hass: HomeAssistant,
+        account: EdilkaminAccount | None = None,
     ) -> None:
-        """Initialize the class."""
+        """Initialize the class.
+
+        Stoves of the same account should share the account, and with it
+        the token and the HTTP client. The requests of the stove, polls and
+        commands alike, go through the same circuit breaker.
+        """
         self._hass = hass
         self._mac_address = mac_address
-        self._username = username
-        self._password = password
+        self._account = account or EdilkaminAccount(hass, username, password)
+        self._metrics = Metrics()
+        self._circuit_breaker = CircuitBreaker(f"Edilkamin {mac_address}")
+        self._command_listeners: list[Callable[[dict], None]] = []
+        self._command_queue = CommandQueue(
+            hass, self._send_command, f"Edilkamin {mac_address}"
+        )
+
+    @property
+    def account(self) -> EdilkaminAccount:
+        """Return the account the device belongs to."""
+        return self._account
+
+    @property
+    def metrics(self) -> Metrics:
+        """Return the metrics of the requests to the device."""
+        return self._metrics
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Return the circuit breaker of the requests to the device."""
+        return self._circuit_breaker
+
+    def add_command_listener(
+        self, listener: Callable[[dict], None]
+    ) -> Callable[[], None]:
+        """Call listener with the payload of every command sent.
+
+        Return a callable that removes the listener.
+        """
+        self._command_listeners.append(listener)
+        return lambda: self._command_listeners.remove(listener)
 
     def get_mac_address(self):
         """Get the mac address."""
@@ -24,9 +83,7 @@ class EdilkaminAsyncApi:
 
     async def authenticate(self) -> bool:
         try:
-            await self._hass.async_add_executor_job(
-                edilkamin.sign_in, self._username, self._password
-            )
+            await self._account.sign_in()
         except Exception:  # noqa: BLE001
             return False
         else:
@@ -78,28 +135,41 @@ class EdilkaminAsyncApi:
         """Call check config."""
         await self.execute_command({"name": "check", "value": False})
 
-    async def get_token(self):
-        return await self._hass.async_add_executor_job(
-            edilkamin.sign_in, self._username, self._password
-        )
+    async def get_token(self) -> str:
+        """Return a valid token of the account."""
+        return await self._account.get_token()
 
     async def get_info(self):
         """Get the device information."""
-        token = await self.get_token()
-        return await self._hass.async_add_executor_job(
-            edilkamin.device_info, token, self._mac_address
-        )
-
-    async def enable_standby_mode(self):
-        """Set the standby mode."""
-        if not await self.is_auto():
+        return await self._circuit_breaker.async_call(self._device_info)
+
+    async def _device_info(self) -> dict:
+        """Request the device information."""
+        with self._metrics.measure("device_info"):
+            return await self._account.device_info(self._mac_address)
+
+    async def enable_standby_mode(self, *, is_auto: bool | None = None):
+        """Set the standby mode.
+
+        Standby needs the auto mode: is_auto is the known auto mode state,
+        it is fetched from the device when not given.
+        """
+        if is_auto is None:
+            is_auto = await self.is_auto()
+        if not is_auto:
             raise NotInRightStateError
 
         await self.execute_command({"name": "standby_mode", "value": True})
 
-    async def disable_standby_mode(self):
-        """Set the standby mode."""
-        if not await self.is_auto():
+    async def disable_standby_mode(self, *, is_auto: bool | None = None):
+        """Set the standby mode.
+
+        Standby needs the auto mode: is_auto is the known auto mode state,
+        it is fetched from the device when not given.
+        """
+        if is_auto is None:
+            is_auto = await self.is_auto()
+        if not is_auto:
             raise NotInRightStateError
 
         await self.execute_command({"name": "standby_mode", "value": False})
@@ -120,31 +190,36 @@ class EdilkaminAsyncApi:
         """Set the manual power level."""
         await self.execute_command({"name": "power_level", "value": value})
 
-    async def execute_command(self, payload: dict) -> str:
-        """Execute the command."""
-        token = await self.get_token()
-        _LOGGER.debug("Execute command with payload = %s", payload)
-        return await self._hass.async_add_executor_job(
-            edilkamin.mqtt_command, token, self._mac_address, payload
-        )
-
-
-class HttpError(Exception):
-    """HTTP exception class with message text, and status code."""
-
-    def __init__(self, message, text, status_code) -> None:
-        """Initialize the class."""
-        super().__init__(message)
-        self.status_code = status_code
-        self.text = text
-
-
-class EdilkaminApiError(Exception):
-    """Base class for exceptions in this module."""
+    def get_command_queue_stats(self) -> dict:
+        """Return the depth and latency statistics of the command queue."""
+        stats = self._command_queue.stats
+        return {
+            "queue_depth": self._command_queue.depth,
+            "commands_queued": stats.queued,
+            "commands_sent": stats.sent,
+            "commands_merged": stats.merged,
+            "commands_failed": stats.failed,
+            "last_latency": stats.last_latency,
+            "average_latency": stats.average_latency,
+        }
 
+    async def execute_command(self, payload: dict) -> str:
+        """Execute the command.
 
-class NotInRightStateError(EdilkaminApiError):
-    """Exception raised when the device is not in the right state."""
+        The command goes through the device queue, so it may be merged with
+        a later command for the same parameter.
+        """
+        return await self._command_queue.async_put(payload)
 
-    def __init__(self):
-        super().__init__("Standby mode is only available from auto mode.")
+    async def _send_command(self, payload: dict) -> str:
+        """Send the command to the device."""
+        _LOGGER.debug("Execute command with payload = %s", payload)
+        result = await self._circuit_breaker.async_call(self._mqtt_command, payload)
+        for listener in list(self._command_listeners):
+            listener(payload)
+        return result
+
+    async def _mqtt_command(self, payload: dict) -> str:
+        """Request the execution of the command."""
+        with self._metrics.measure("mqtt_command"):
+            return await self._account.mqtt_command(self._mac_address, payload)
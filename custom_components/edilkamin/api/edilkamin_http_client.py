@@ -0,0 +1,99 @@
+"""Asyncio HTTP client for the Edilkamin cloud API."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+from edilkamin import constants
+from edilkamin.buffer_utils import process_response
+
+from .exceptions import HttpError
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+_LOGGER = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+
+def format_mac(mac_address: str) -> str:
+    """Format the mac address the way the API expects it (aabbccddeeff)."""
+    return mac_address.replace(":", "").lower()
+
+
+class EdilkaminHttpClient:
+    """Send requests to the Edilkamin cloud on a shared aiohttp session.
+
+    The session is owned by the caller (Home Assistant's shared client
+    session in production), so connections are pooled and kept alive
+    between polls instead of being opened for every request.
+    """
+
+    def __init__(
+        self, session: aiohttp.ClientSession, base_url: str = constants.NEW_API_URL
+    ) -> None:
+        """Initialize the client."""
+        self._session = session
+        self._base_url = base_url.rstrip("/") + "/"
+
+    @property
+    def base_url(self) -> str:
+        """Return the base URL of the API."""
+        return self._base_url
+
+    @property
+    def cognito_url(self) -> str | None:
+        """Return the URL of the authentication API of a custom base URL.
+
+        None for the Edilkamin cloud, whose accounts are in its Cognito user
+        pool. Another API, like the fake cloud of the tests, serves the
+        Cognito InitiateAuth action at cognito.
+        """
+        if self._base_url == constants.NEW_API_URL.rstrip("/") + "/":
+            return None
+        return self._base_url + "cognito"
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the session the requests are sent on."""
+        return self._session
+
+    async def device_info(self, token: str, mac_address: str) -> dict:
+        """Get the device information."""
+        data = await self._request(
+            "GET", f"device/{format_mac(mac_address)}/info", token
+        )
+        # Some fields are sent as gzip compressed buffers
+        return process_response(data)
+
+    async def mqtt_command(
+        self, token: str, mac_address: str, payload: Mapping[str, Any]
+    ) -> str:
+        """Send a MQTT command to the device."""
+        return await self._request(
+            "PUT",
+            "mqtt/command",
+            token,
+            json={"mac_address": format_mac(mac_address), **payload},
+        )
+
+    async def _request(
+        self, method: str, path: str, token: str, json: dict | None = None
+    ) -> Any:
+        """Send the request and return the decoded json body."""
+        async with self._session.request(
+            method,
+            self._base_url + path,
+            json=json,
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=REQUEST_TIMEOUT,
+        ) as response:
+            if response.status >= 400:
+                text = await response.text()
+                msg = f"{method} {path} failed with status {response.status}"
+                _LOGGER.debug("%s: %s", msg, text)
+                raise HttpError(msg, text, response.status)
+            return await response.json(content_type=None)
@@ -0,0 +1,32 @@
+"""Exceptions raised by the Edilkamin API clients."""
+
+
+class HttpError(Exception):
+    """HTTP exception class with message text, and status code."""
+
+    def __init__(self, message, text, status_code) -> None:
+        """Initialize the class."""
+        super().__init__(message)
+        self.status_code = status_code
+        self.text = text
+
+
+class EdilkaminApiError(Exception):
+    """Base class for exceptions in this module."""
+
+
+class NotInRightStateError(EdilkaminApiError):
+    """Exception raised when the device is not in the right state."""
+
+    def __init__(self):
+        super().__init__("Standby mode is only available from auto mode.")
+
+
+class CircuitOpenError(EdilkaminApiError):
+    """Exception raised when requests are held back after cloud failures."""
+
+    def __init__(self, retry_in: float) -> None:
+        super().__init__(
+            f"Edilkamin cloud unavailable, next attempt in {retry_in:.0f} seconds"
+        )
+        self.retry_in = retry_in
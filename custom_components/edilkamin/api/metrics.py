@@ -0,0 +1,97 @@
+"""Counters and latency histograms of the calls to the Edilkamin cloud."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class CallMetrics:
+    """Count and latency of a type of call."""
+
+    calls: int = 0
+    errors: int = 0
+    total_latency: float = 0.0
+    last_latency: float | None = None
+    max_latency: float | None = None
+    # One bucket per bound of LATENCY_BUCKETS, and one above them
+    histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+
+    @property
+    def average_latency(self) -> float | None:
+        """Return the average latency, in seconds."""
+        if not self.calls:
+            return None
+        return self.total_latency / self.calls
+
+    @property
+    def error_rate(self) -> float | None:
+        """Return the share of the calls that failed."""
+        if not self.calls:
+            return None
+        return self.errors / self.calls
+
+    def record(self, latency: float, *, error: bool = False) -> None:
+        """Record a call."""
+        self.calls += 1
+        self.errors += error
+        self.total_latency += latency
+        self.last_latency = latency
+        self.max_latency = max(latency, self.max_latency or 0.0)
+        self.histogram[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics, for the diagnostics."""
+        bounds = [f"<={bound}s" for bound in LATENCY_BUCKETS]
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": self.error_rate,
+            "average_latency": self.average_latency,
+            "last_latency": self.last_latency,
+            "max_latency": self.max_latency,
+            "histogram": dict(
+                zip([*bounds, f">{LATENCY_BUCKETS[-1]}s"], self.histogram, strict=True)
+            ),
+        }
+
+
+class Metrics:
+    """Metrics of the calls made by a component, by type of call."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self._calls: dict[str, CallMetrics] = {}
+
+    def get(self, call: str) -> CallMetrics:
+        """Return the metrics of a type of call."""
+        if (metrics := self._calls.get(call)) is None:
+            metrics = self._calls[call] = CallMetrics()
+        return metrics
+
+    @contextmanager
+    def measure(self, call: str) -> Iterator[None]:
+        """Measure the call run in the block, failed if it raises."""
+        start = monotonic()
+        try:
+            yield
+        except BaseException:
+            self.get(call).record(monotonic() - start, error=True)
+            raise
+        self.get(call).record(monotonic() - start)
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return the metrics of every type of call, for the diagnostics."""
+        return {call: metrics.as_dict() for call, metrics in self._calls.items()}
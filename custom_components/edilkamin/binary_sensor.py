@@ -2,16 +2,32 @@
 
 from __future__ import annotations
 
+from datetime import datetime, timedelta
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
 )
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.helpers import entity_platform
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from custom_components.edilkamin.api.edilkamin_async_api import CircuitOpenError
+
+from .const import (
+    CONF_CHECK_INTERVAL,
+    DATA_API,
+    DATA_COORDINATOR,
+    DEFAULT_CHECK_INTERVAL,
+    DOMAIN,
+    SERVICE_CHECK_CONFIGURATION,
+)
+from .snapshot import PATH_PELLET_IN_RESERVE
 
 if TYPE_CHECKING:
     from custom_components.edilkamin.api.edilkamin_async_api import (
@@ -23,23 +39,33 @@ _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, config_entry, async_add_devices):
     """Add sensors for passed config_entry in HA."""
-    coordinator = hass.data[DOMAIN]["coordinator"]
-    async_api = hass.data[DOMAIN][config_entry.entry_id]
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = entry_data[DATA_COORDINATOR]
+    async_api = entry_data[DATA_API]
+
+    check_interval = config_entry.options.get(
+        CONF_CHECK_INTERVAL, DEFAULT_CHECK_INTERVAL
+    )
 
     async_add_devices(
         [
             EdilkaminTankBinarySensor(coordinator),
-            EdilkaminCheckBinarySensor(async_api),
+            EdilkaminCheckBinarySensor(async_api, check_interval),
         ]
     )
 
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_CHECK_CONFIGURATION, None, "async_check"
+    )
+
 
 class EdilkaminTankBinarySensor(CoordinatorEntity, BinarySensorEntity):
     """Representation of a Sensor."""
 
     def __init__(self, coordinator) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=frozenset({PATH_PELLET_IN_RESERVE}))
         self._state = None
         self._mac_address = self.coordinator.get_mac_address()
         self._attr_icon = "mdi:storage-tank"
@@ -68,14 +94,23 @@ class EdilkaminTankBinarySensor(CoordinatorEntity, BinarySensorEntity):
         self.async_write_ha_state()
 
 
-class EdilkaminCheckBinarySensor(BinarySensorEntity):
-    """Representation of a Sensor."""
+class EdilkaminCheckBinarySensor(BinarySensorEntity, RestoreEntity):
+    """Representation of a Sensor.
+
+    The check sends a command to the stove, so it runs on a long schedule
+    (check_interval minutes, 0 for never) or on demand through the
+    check_configuration service, instead of at every entity poll.
+    """
+
+    _attr_should_poll = False
 
-    def __init__(self, api: EdilkaminAsyncApi) -> None:
+    def __init__(self, api: EdilkaminAsyncApi, check_interval: int) -> None:
         """Initialize the sensor."""
         self._state = None
         self._api = api
         self._mac_address = self._api.get_mac_address()
+        self._check_interval = check_interval
+        self._last_check: datetime | None = None
 
         self._attr_name = "Check configuration"
         self._attr_device_info = {"identifiers": {("edilkamin", self._mac_address)}}
@@ -96,13 +131,59 @@ class EdilkaminCheckBinarySensor(BinarySensorEntity):
         """Return a unique_id for this entity."""
         return f"{self._mac_address}_check_binary_sensor"
 
-    async def async_update(self) -> None:
-        """Fetch new state data for the sensor."""
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the time of the last check."""
+        return {"last_check": self._last_check}
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last result and schedule the next checks."""
+        await super().async_added_to_hass()
+        if (last_state := await self.async_get_last_state()) is not None:
+            if last_state.state in (STATE_ON, STATE_OFF):
+                self._state = last_state.state == STATE_ON
+            last_check = last_state.attributes.get("last_check")
+            if isinstance(last_check, str):
+                last_check = dt_util.parse_datetime(last_check)
+            self._last_check = last_check
+
+        if self._check_interval:
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass,
+                    self._async_scheduled_check,
+                    timedelta(minutes=self._check_interval),
+                )
+            )
+            # The timer starts over at every restart, catch up on a missed check
+            if self.is_check_due(dt_util.utcnow()):
+                self.hass.async_create_background_task(
+                    self.async_check(), f"Edilkamin check {self._mac_address}"
+                )
+
+    def is_check_due(self, now: datetime) -> bool:
+        """Check if the last check is older than the check interval."""
+        if not self._check_interval:
+            return False
+        if self._last_check is None:
+            return True
+        return now - self._last_check >= timedelta(minutes=self._check_interval)
+
+    async def _async_scheduled_check(self, _now: datetime) -> None:
+        """Run the scheduled check."""
+        await self.async_check()
+
+    async def async_check(self) -> None:
+        """Check the stove is reachable through the API."""
         try:
             await self._api.check()
             self._state = False
-            self.async_write_ha_state()
+        except CircuitOpenError:
+            # The cloud is known to be down, the check would tell nothing new
+            _LOGGER.debug("Configuration check skipped, the cloud is unavailable")
+            return
         except Exception:
             self._state = True
-            self.async_write_ha_state()
             _LOGGER.exception("Exception occurred during check configuration")
+        self._last_check = dt_util.utcnow()
+        self.async_write_ha_state()
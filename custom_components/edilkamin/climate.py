@@ -16,7 +16,15 @@ from homeassistant.components.climate import (
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DATA_API, DATA_COORDINATOR, DOMAIN
+from .snapshot import (
+    PATH_IS_AUTO,
+    PATH_MANUAL_POWER,
+    PATH_POWER,
+    PATH_TARGET_TEMPERATURE,
+    PATH_TEMPERATURE,
+    fan_speed_path,
+)
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -46,12 +54,25 @@ PRESET_MODE_TO_POWER = {
     "Manual P5": 5,
 }
 
+# Fields read by the climate entity
+CLIMATE_PATHS = frozenset(
+    {
+        PATH_TEMPERATURE,
+        PATH_TARGET_TEMPERATURE,
+        fan_speed_path(1),
+        PATH_POWER,
+        PATH_IS_AUTO,
+        PATH_MANUAL_POWER,
+    }
+)
+
 
 async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_devices):
     """Add sensors for passed config_entry in HA."""
 
-    async_api = hass.data[DOMAIN][config_entry.entry_id]
-    coordinator = hass.data[DOMAIN]["coordinator"]
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    async_api = entry_data[DATA_API]
+    coordinator = entry_data[DATA_COORDINATOR]
 
     async_add_devices([EdilkaminClimateEntity(async_api, coordinator)])
 
@@ -61,7 +82,7 @@ class EdilkaminClimateEntity(CoordinatorEntity, ClimateEntity):
 
     def __init__(self, api: EdilkaminAsyncApi, coordinator) -> None:
         """Initialize the climate."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=CLIMATE_PATHS)
         self.api = api
 
         self._state = None
@@ -108,14 +129,12 @@ class EdilkaminClimateEntity(CoordinatorEntity, ClimateEntity):
     async def async_set_fan_mode(self, fan_mode):
         """Set new target fan mode."""
         await self.api.set_fan_speed(fan_mode)
-        await self.coordinator.async_refresh()
 
     async def async_set_temperature(self, **kwargs):
         """Set new target temperature."""
         if kwargs.get(ATTR_TEMPERATURE) is not None:
             target_tmp = kwargs.get(ATTR_TEMPERATURE)
             await self.api.set_temperature(target_tmp)
-        await self.coordinator.async_refresh()
 
     def _handle_coordinator_update(self) -> None:
         self._attr_current_temperature = self.coordinator.get_temperature()
@@ -148,8 +167,6 @@ class EdilkaminClimateEntity(CoordinatorEntity, ClimateEntity):
         if hvac_mode == HVACMode.HEAT:
             await self.api.enable_power()
 
-        await self.coordinator.async_refresh()
-
     async def async_turn_on(self):
         """Turn on."""
         await self.async_set_hvac_mode(HVACMode.HEAT)
@@ -165,4 +182,3 @@ class EdilkaminClimateEntity(CoordinatorEntity, ClimateEntity):
         else:
             await self.api.disable_auto_mode()
             await self.api.set_manual_power_level(PRESET_MODE_TO_POWER[preset_mode])
-        await self.coordinator.async_refresh()
@@ -5,13 +5,37 @@ from __future__ import annotations
 import logging
 
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
 import macaddress
 import voluptuous as vol
 
 from custom_components.edilkamin.api.edilkamin_async_api import EdilkaminAsyncApi
 
-from .const import DOMAIN, MAC_ADDRESS, PASSWORD, USERNAME
+from .const import (
+    CONF_BASE_URL,
+    CONF_CHECK_INTERVAL,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_IDLE_SCAN_INTERVAL,
+    CONF_PELLET_CONSUMPTION,
+    CONF_SCAN_INTERVAL,
+    CONF_STATE_MAX_AGE,
+    DEFAULT_CHECK_INTERVAL,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_PELLET_CONSUMPTION,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STATE_MAX_AGE,
+    DOMAIN,
+    MAC_ADDRESS,
+    MAX_CHECK_INTERVAL,
+    MAX_PELLET_CONSUMPTION,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    PASSWORD,
+    USERNAME,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,12 +47,27 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+SCAN_INTERVAL_VALIDATOR = vol.All(
+    vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL)
+)
+PELLET_CONSUMPTION_VALIDATOR = vol.All(
+    vol.Coerce(float), vol.Range(min=0, min_included=False, max=MAX_PELLET_CONSUMPTION)
+)
+
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Edilkamin."""
 
     VERSION = 2
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        _config_entry: config_entries.ConfigEntry,
+    ) -> EdilkaminOptionsFlow:
+        """Get the options flow for this handler."""
+        return EdilkaminOptionsFlow()
+
     async def async_step_user(self, user_input):
         """Handle the initial step."""
         errors: dict[str, str] = {}
@@ -76,5 +115,60 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class EdilkaminOptionsFlow(config_entries.OptionsFlow):
+    """Handle the options of an Edilkamin entry."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage the polling, the check and the pellet consumption."""
+        options = self.config_entry.options
+        if user_input is not None:
+            if not self.show_advanced_options and CONF_BASE_URL in options:
+                # The base URL is only shown in advanced mode, keep it otherwise
+                user_input = {**user_input, CONF_BASE_URL: options[CONF_BASE_URL]}
+            return self.async_create_entry(data=user_input)
+
+        fields = {
+            vol.Required(
+                CONF_FAST_SCAN_INTERVAL,
+                default=options.get(
+                    CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL
+                ),
+            ): SCAN_INTERVAL_VALIDATOR,
+            vol.Required(
+                CONF_SCAN_INTERVAL,
+                default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+            ): SCAN_INTERVAL_VALIDATOR,
+            vol.Required(
+                CONF_IDLE_SCAN_INTERVAL,
+                default=options.get(
+                    CONF_IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL
+                ),
+            ): SCAN_INTERVAL_VALIDATOR,
+            vol.Required(
+                CONF_STATE_MAX_AGE,
+                default=options.get(CONF_STATE_MAX_AGE, DEFAULT_STATE_MAX_AGE),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_SCAN_INTERVAL)),
+            vol.Required(
+                CONF_CHECK_INTERVAL,
+                default=options.get(CONF_CHECK_INTERVAL, DEFAULT_CHECK_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_CHECK_INTERVAL)),
+        }
+        for level, key in CONF_PELLET_CONSUMPTION.items():
+            fields[
+                vol.Required(
+                    key, default=options.get(key, DEFAULT_PELLET_CONSUMPTION[level])
+                )
+            ] = PELLET_CONSUMPTION_VALIDATOR
+        if self.show_advanced_options:
+            # Left empty, the official cloud is used
+            fields[
+                vol.Optional(
+                    CONF_BASE_URL,
+                    description={"suggested_value": options.get(CONF_BASE_URL)},
+                )
+            ] = cv.url
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(fields))
+
+
 class InvalidMacAddressError(HomeAssistantError):
     """Error to indicate there is invalid mac address."""
@@ -5,3 +5,52 @@ DOMAIN = "edilkamin"
 MAC_ADDRESS = "mac_address"
 USERNAME = "username"
 PASSWORD = "password"  # noqa: S105
+
+# Options, polling intervals in seconds
+CONF_FAST_SCAN_INTERVAL = "fast_scan_interval"
+CONF_SCAN_INTERVAL = "scan_interval"
+CONF_IDLE_SCAN_INTERVAL = "idle_scan_interval"
+# Maximum age, in seconds, of the cached state used to check a command
+CONF_STATE_MAX_AGE = "state_max_age"
+# Interval, in minutes, of the configuration check, 0 to only run it on demand
+CONF_CHECK_INTERVAL = "check_interval"
+# Base URL of the device API, to use a stand-in for the Edilkamin cloud
+CONF_BASE_URL = "base_url"
+# Pellet burnt, in kg/h, at each power level, keyed by level
+CONF_PELLET_CONSUMPTION = {
+    level: f"pellet_consumption_p{level}" for level in range(1, 6)
+}
+
+DEFAULT_FAST_SCAN_INTERVAL = 5
+DEFAULT_SCAN_INTERVAL = 15
+DEFAULT_IDLE_SCAN_INTERVAL = 120
+DEFAULT_STATE_MAX_AGE = 60
+DEFAULT_CHECK_INTERVAL = 360
+# The stove does not report its pellet consumption, these are typical values
+# of a 9 kW stove
+DEFAULT_PELLET_CONSUMPTION = {1: 0.8, 2: 1.1, 3: 1.4, 4: 1.7, 5: 2.1}
+
+MIN_SCAN_INTERVAL = 5
+MAX_SCAN_INTERVAL = 3600
+MAX_CHECK_INTERVAL = 10080
+MAX_PELLET_CONSUMPTION = 10
+
+SERVICE_CHECK_CONFIGURATION = "check_configuration"
+
+# Event fired for every new alarm of a stove
+EVENT_ALARM = f"{DOMAIN}_alarm"
+# Event fired when the tank of a stove was refilled
+EVENT_PELLET_REFILL = f"{DOMAIN}_pellet_refill"
+
+# Keys of the data stored for each config entry
+DATA_API = "api"
+DATA_COORDINATOR = "coordinator"
+# Accounts shared by the entries, keyed by username
+DATA_ACCOUNTS = f"{DOMAIN}_accounts"
+
+# Storage of the last device information of each entry, keyed by entry id
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.device_info"
+PELLET_STORAGE_KEY = f"{DOMAIN}.pellet"
+# Storage of the token of each account, keyed by a digest of the username
+TOKEN_STORAGE_KEY = f"{DOMAIN}.token"
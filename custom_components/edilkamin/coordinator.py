@@ -1,15 +1,121 @@
-from datetime import UTC, datetime, timedelta
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta
 import logging
+from time import localtime, monotonic, strftime
+from typing import TYPE_CHECKING, Any
 
 import async_timeout
-import edilkamin
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-import jwt
-
-from custom_components.edilkamin.api.edilkamin_async_api import EdilkaminAsyncApi
+from homeassistant.util import dt as dt_util
+
+from custom_components.edilkamin.api.metrics import Metrics
+
+from .const import (
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_IDLE_SCAN_INTERVAL,
+    CONF_PELLET_CONSUMPTION,
+    CONF_SCAN_INTERVAL,
+    CONF_STATE_MAX_AGE,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_PELLET_CONSUMPTION,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STATE_MAX_AGE,
+    EVENT_ALARM,
+    EVENT_PELLET_REFILL,
+)
+from .pellet import PelletEstimator
+from .snapshot import EdilkaminSnapshot, changed_paths
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+    from homeassistant.helpers.storage import Store
+
+    from custom_components.edilkamin.api.edilkamin_async_api import EdilkaminAsyncApi
 
 _LOGGER = logging.getLogger(__name__)
 
+# Where each command is reflected in the device information
+COMMAND_PATHS = {
+    "power": ("status", "commands", "power"),
+    "airkare_function": ("status", "flags", "is_airkare_active"),
+    "relax_mode": ("status", "flags", "is_relax_active"),
+    "chrono_mode": ("nvm", "chrono", "is_active"),
+    "enviroment_1_temperature": ("nvm", "user_parameters", "enviroment_1_temperature"),
+    "standby_mode": ("nvm", "user_parameters", "is_standby_active"),
+    "auto_mode": ("nvm", "user_parameters", "is_auto"),
+    "power_level": ("nvm", "user_parameters", "manual_power"),
+}
+# Commands sent as 0/1 but reported as booleans
+BOOLEAN_COMMANDS = frozenset({"power", "airkare_function"})
+
+# Commands that do not change the state of the device
+PASSIVE_COMMANDS = frozenset({"check"})
+
+# Wait for a burst of commands to end before refreshing the device
+REFRESH_AFTER_COMMAND_COOLDOWN = 2
+
+# Ignition, Shutdown, Cooling and Final cleaning, the Alarm phase lasts until
+# the stove is reset so it is polled at the normal interval
+FAST_POLL_PHASES = frozenset({1, 3, 4, 6})
+PHASE_OFF = 0
+# Poll fast for this long after a command, to catch the device reacting
+COMMAND_FAST_POLL_DURATION = 60
+
+# Delay before writing the device information, to batch consecutive fetches
+STORE_SAVE_DELAY = 60
+
+# Alarms kept for the alarm sensor attribute
+RECENT_ALARMS = 10
+
+
+def optimistic_update(payload: dict) -> dict | None:
+    """Build the device information update expected from a command."""
+    name = payload.get("name")
+    value = payload.get("value")
+    if name in BOOLEAN_COMMANDS:
+        value = bool(value)
+
+    path = COMMAND_PATHS.get(name)
+    if path is None and name.startswith("fan_") and name.endswith("_speed"):
+        index = name.removeprefix("fan_").removesuffix("_speed")
+        path = ("nvm", "user_parameters", f"fan_{index}_ventilation")
+    if path is None:
+        return None
+
+    update = value
+    for key in reversed(path):
+        update = {key: update}
+    return update
+
+
+def merge_device_info(current: dict, update: dict) -> dict:
+    """Return a copy of current with the (partial) update merged into it."""
+    merged = dict(current)
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_device_info(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def format_alarm(alarm: dict) -> dict:
+    """Return an alarm of the log, with a readable timestamp."""
+    timestamp = alarm.get("timestamp")
+    return {
+        "type": alarm.get("type"),
+        "timestamp": None
+        if timestamp is None
+        else strftime("%d-%m-%Y %H:%M:%S", localtime(timestamp)),
+    }
+
 
 class EdilkaminCoordinator(DataUpdateCoordinator):
     """My custom coordinator."""
@@ -17,80 +123,298 @@ class EdilkaminCoordinator(DataUpdateCoordinator):
     def __init__(
         self,
         hass,
-        username: str,
-        password: str,
-        mac_address: str,
+        api: EdilkaminAsyncApi,
+        options: Mapping[str, Any] | None = None,
+        store: Store | None = None,
+        pellet_store: Store | None = None,
     ) -> None:
-        """Initialize the coordinator."""
+        """Initialize the coordinator.
+
+        The API is the one of the config entry, shared with the entities,
+        so reads and commands use the same token and HTTP session. The last
+        device information fetched is kept in store, and the state of the
+        pellet estimation in pellet_store, when given.
+        """
+        options = options or {}
+        self._fast_interval = timedelta(
+            seconds=options.get(CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL)
+        )
+        self._poll_interval = timedelta(
+            seconds=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        )
+        self._idle_interval = timedelta(
+            seconds=options.get(CONF_IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL)
+        )
+        self._state_max_age = options.get(CONF_STATE_MAX_AGE, DEFAULT_STATE_MAX_AGE)
+        self._pellet_consumption = {
+            level: options.get(key, DEFAULT_PELLET_CONSUMPTION[level])
+            for level, key in CONF_PELLET_CONSUMPTION.items()
+        }
+        self._api = api
+        self._store = store
+        self._pellet_store = pellet_store
+        self._save_scheduled = False
+        self._mac_address = api.get_mac_address()
         super().__init__(
             hass,
             _LOGGER,
-            name="Edilkamin coordinator",
-            update_interval=timedelta(seconds=15),
-        )
-        self._username = username
-        self._password = password
-        self._mac_address = mac_address
-
-        self._token = None
-        self._device_info = {}
-        self._edilkamin_wrapper = EdilkaminAsyncApi(
-            mac_address=mac_address, username=username, password=password, hass=hass
-        )
-
-    async def refresh_token(self) -> str:
-        """Refresh the token only if expired."""
-        _LOGGER.debug("Refreshing token")
-        if self._token is None or self.is_token_expired(self._token):
-            _LOGGER.debug("Token is expired or None, signing in again")
-            self._token = await self.hass.async_add_executor_job(
-                edilkamin.sign_in, self._username, self._password
-            )
-            _LOGGER.debug("Token refreshed")
-        else:
-            _LOGGER.debug("Token is still valid, using existing one")
-
-        return self._token
-
-    def is_token_expired(self, token: str) -> bool:
-        """Check if the token is expired."""
-        try:
-            payload = jwt.decode(token, options={"verify_signature": False})
-            exp = payload.get("exp")
-            if exp is None:
-                return True
-            exp_date = datetime.fromtimestamp(exp, tz=UTC)
-            # Add a buffer of 60 seconds to the expiration time
-            return exp_date < datetime.now(tz=UTC) + timedelta(seconds=60)
-        except (jwt.PyJWTError, KeyError):
-            return True
-        except Exception:  # noqa: BLE001
-            return True
-
-    async def update_device_information(self) -> None:
-        """Get the latest data and update the relevant Entity attributes."""
-        self._token = await self.refresh_token()
-        return await self.hass.async_add_executor_job(
-            edilkamin.device_info, self._token, self._mac_address
+            name=f"Edilkamin coordinator {self._mac_address}",
+            update_interval=self._poll_interval,
+            request_refresh_debouncer=Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=REFRESH_AFTER_COMMAND_COOLDOWN,
+                immediate=False,
+            ),
         )
+        self._metrics = Metrics()
+        self._last_command: float | None = None
+        self._last_fetch: float | None = None
+
+        self._snapshot = EdilkaminSnapshot()
+        self._pellet = PelletEstimator()
+        # Index of the alarm log already processed, None before the first data
+        self._alarm_index: int | None = None
+        self._recent_alarms: deque[dict] = deque(maxlen=RECENT_ALARMS)
+        self._recent_alarms_list: list[dict] = []
+        # Paths changed since listeners were last notified, None for all
+        self._changed_paths: set[tuple] | None = None
+        self._notified_success = True
+        self._fetch: asyncio.Task | None = None
+
+    @property
+    def api(self) -> EdilkaminAsyncApi:
+        """Return the API used to fetch the device information."""
+        return self._api
+
+    @property
+    def metrics(self) -> Metrics:
+        """Return the metrics of the updates."""
+        return self._metrics
+
+    async def update_device_information(self) -> dict:
+        """Get the latest data and update the relevant Entity attributes.
+
+        Concurrent callers share the fetch in flight and its result, so a
+        burst of refreshes only sends one request.
+        """
+        if self._fetch is None:
+            self._fetch = asyncio.ensure_future(self._api.get_info())
+            self._fetch.add_done_callback(self._fetch_done)
+        # A caller timing out must not cancel the fetch of the others
+        return await asyncio.shield(self._fetch)
+
+    def _fetch_done(self, fetch: asyncio.Task) -> None:
+        """Forget the finished fetch, so the next caller starts a new one."""
+        self._fetch = None
+        if not fetch.cancelled():
+            # Retrieved here in case every caller gave up on it
+            fetch.exception()
 
     async def _async_update_data(self):
         """Fetch data from the API."""
         try:
             # Note: asyncio.TimeoutError and aiohttp.ClientError are already
             # handled by the data update coordinator.
-            async with async_timeout.timeout(10):
-                self._device_info = await self.update_device_information()
+            with self._metrics.measure("update"):
+                async with async_timeout.timeout(10):
+                    info = await self.update_device_information()
+                self._set_device_info(info)
+                self._last_fetch = monotonic()
+                self._add_pellet_sample()
+                self._async_schedule_save()
                 _LOGGER.debug("Data updated successfully")
                 _LOGGER.debug(self._device_info)
+                self.update_interval = self._compute_update_interval()
                 return self._device_info
         except Exception as e:
             msg = "Error communicating with API"
             raise UpdateFailed(msg) from e
 
-    def get_token(self) -> str:
-        """Return the current token."""
-        return self._token
+    async def async_load_stored(self) -> bool:
+        """Seed the coordinator with the stored device information.
+
+        The pellet estimation is restored too. Return whether there was a
+        device information. The stored state counts as stale, so
+        checks needing a fresh state still fetch the device.
+        """
+        if self._pellet_store is not None and (
+            pellet := await self._pellet_store.async_load()
+        ):
+            self._pellet = PelletEstimator.from_dict(pellet)
+        if self._store is None or not (info := await self._store.async_load()):
+            return False
+        _LOGGER.debug("Restored the device information of %s", self._mac_address)
+        self._set_device_info(info)
+        self.data = self._device_info
+        return True
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Store the device information, once the save delay elapsed."""
+        if self._store is None or self._save_scheduled:
+            return
+        self._save_scheduled = True
+        self._store.async_delay_save(self._data_to_save, STORE_SAVE_DELAY)
+        if self._pellet_store is not None:
+            self._pellet_store.async_delay_save(self._pellet.as_dict, STORE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        """Return the latest device information, when the store writes it."""
+        self._save_scheduled = False
+        return self._device_info
+
+    @property
+    def snapshot(self) -> EdilkaminSnapshot:
+        """Return the snapshot of the latest device information."""
+        return self._snapshot
+
+    @property
+    def _device_info(self) -> dict:
+        """Return the latest device information."""
+        return self._snapshot.device_info
+
+    @_device_info.setter
+    def _device_info(self, info: dict) -> None:
+        self._set_device_info(info)
+
+    def _set_device_info(self, info: dict) -> None:
+        """Store the snapshot of the device information and the paths it changed."""
+        snapshot = EdilkaminSnapshot.from_device_info(info)
+        if self._changed_paths is not None:
+            self._changed_paths |= changed_paths(self._snapshot.leaves, snapshot.leaves)
+        self._snapshot = snapshot
+        if snapshot.nb_alarms != self._alarm_index:
+            self._process_alarms(snapshot)
+
+    def _process_alarms(self, snapshot: EdilkaminSnapshot) -> None:
+        """Process the alarms added to the log since it was last processed.
+
+        Each new alarm fires an event and joins the recent alarms. The log
+        found at startup, or after it was reset, is history: it only fills
+        the recent alarms.
+        """
+        index = snapshot.nb_alarms or 0
+        alarms = snapshot.alarms
+        if self._alarm_index is None or index < self._alarm_index:
+            self._recent_alarms.clear()
+            self._recent_alarms.extend(
+                format_alarm(alarm) for alarm in alarms[-RECENT_ALARMS:]
+            )
+        else:
+            for position, alarm in enumerate(
+                alarms[self._alarm_index :], start=self._alarm_index
+            ):
+                formatted = format_alarm(alarm)
+                self._recent_alarms.append(formatted)
+                _LOGGER.debug("New alarm %s on %s", formatted, self._mac_address)
+                self.hass.bus.async_fire(
+                    EVENT_ALARM,
+                    {"mac_address": self._mac_address, "index": position, **formatted},
+                )
+        self._alarm_index = index
+        self._recent_alarms_list = list(self._recent_alarms)
+
+    @callback
+    def _add_pellet_sample(self) -> None:
+        """Feed the device state to the pellet estimation."""
+        added = self._pellet.add_sample(
+            dt_util.utcnow().timestamp(), self._snapshot, self._pellet_consumption
+        )
+        if added is not None:
+            _LOGGER.debug("Tank of %s refilled with %s kg", self._mac_address, added)
+            self.hass.bus.async_fire(
+                EVENT_PELLET_REFILL, {"mac_address": self._mac_address, "added": added}
+            )
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, starting with the current data.
+
+        Listeners are only called when their fields change, so a new one
+        gets the data it missed right away.
+        """
+        remove_listener = super().async_add_listener(update_callback, context)
+        if self.data is not None:
+            update_callback()
+        return remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners whose fields changed.
+
+        A listener context is the set of paths the listener reads; listeners
+        without context are always updated, and so is everyone when the
+        availability of the device changed.
+        """
+        changed = self._changed_paths
+        if self.last_update_success != self._notified_success:
+            changed = None
+        self._changed_paths = set()
+        self._notified_success = self.last_update_success
+
+        for update_callback, context in list(self._listeners.values()):
+            if changed is None or context is None or not changed.isdisjoint(context):
+                update_callback()
+
+    async def async_ensure_fresh(self, max_age: float | None = None) -> None:
+        """Refresh the device information if it is older than max_age seconds.
+
+        Defaults to the configured maximum state age.
+        """
+        if max_age is None:
+            max_age = self._state_max_age
+        if self._last_fetch is None or monotonic() - self._last_fetch > max_age:
+            _LOGGER.debug("Cached state is stale, refreshing it")
+            await self.async_refresh()
+
+    async def async_is_auto(self, max_age: float | None = None) -> bool:
+        """Check if the device is in auto mode, from a fresh enough state."""
+        await self.async_ensure_fresh(max_age)
+        return self.is_auto()
+
+    @callback
+    def async_handle_command(self, payload: dict) -> None:
+        """Reflect a command sent to the device, then refresh it.
+
+        The expected state is applied right away so entities do not wait
+        for the cloud. The confirming refresh is debounced: a burst of
+        commands only triggers a single fetch once the burst is over.
+        """
+        if payload.get("name") in PASSIVE_COMMANDS:
+            return
+        _LOGGER.debug("Command %s sent, polling faster", payload.get("name"))
+        self._last_command = monotonic()
+        self.update_interval = self._fast_interval
+
+        if (update := optimistic_update(payload)) is not None:
+            self._set_device_info(merge_device_info(self._device_info, update))
+            self.data = self._device_info
+            self.async_update_listeners()
+
+        self.hass.async_create_task(self.async_request_refresh())
+
+    def _compute_update_interval(self) -> timedelta:
+        """Pick the polling interval from the state of the device.
+
+        Poll fast while the device is changing (phase transitions, right
+        after a command), slowly while it is off.
+        """
+        if (
+            self._last_command is not None
+            and monotonic() - self._last_command < COMMAND_FAST_POLL_DURATION
+        ):
+            return self._fast_interval
+
+        phase = self.get_operational_phase()
+        if phase in FAST_POLL_PHASES:
+            return self._fast_interval
+        if phase == PHASE_OFF and not self.get_power_status():
+            return self._idle_interval
+        return self._poll_interval
 
     def get_mac_address(self) -> str:
         """Return the MAC address."""
@@ -98,133 +422,103 @@ class EdilkaminCoordinator(DataUpdateCoordinator):
 
     def get_temperature(self) -> float | None:
         """Get the environment temperature."""
-        return (
-            self._device_info.get("status", {})
-            .get("temperatures", {})
-            .get("enviroment")
-        )
+        return self._snapshot.temperature
 
     def get_fan_speed(self, index: int = 1) -> str:
         """Get the fan speed."""
-        return (
-            self._device_info.get("nvm", {})
-            .get("user_parameters", {})
-            .get(f"fan_{index}_ventilation")
-        )
+        return self._snapshot.fan_speeds.get(index)
 
     def get_nb_fans(self) -> int:
         """Get the number of fans."""
-        return (
-            self._device_info.get("nvm", {})
-            .get("installer_parameters", {})
-            .get("fans_number", 0)
-        )
+        return self._snapshot.nb_fans
 
     def get_nb_alarms(self) -> int:
         """Get the number of alarms."""
-        return self._device_info.get("nvm", {}).get("alarms_log", {}).get("index", 0)
+        return self._snapshot.nb_alarms
 
     def get_alarms(self) -> list:
         """Get the alarms."""
-        alarms_info = self._device_info.get("nvm", {}).get("alarms_log", {})
-        index = alarms_info.get("index", 0)
-        alarms = alarms_info.get("alarms", [])
-        return [alarms[i] for i in range(min(index, len(alarms)))]
+        return self._snapshot.alarms
+
+    def get_recent_alarms(self) -> list[dict]:
+        """Get the latest alarms, oldest first, with readable timestamps.
+
+        The same list is returned until a new alarm is processed.
+        """
+        return self._recent_alarms_list
 
     def get_actual_power(self) -> str | None:
         """Get the actual power."""
-        return self._device_info.get("status", {}).get("state", {}).get("actual_power")
+        return self._snapshot.actual_power
 
     def get_status_tank(self) -> str | None:
         """Get the status of the tank."""
-        return (
-            self._device_info.get("status", {})
-            .get("flags", {})
-            .get("is_pellet_in_reserve")
-        )
+        return self._snapshot.pellet_in_reserve
 
     def get_airkare_status(self) -> str:
         """Get the status of the airkare."""
-        return (
-            self._device_info.get("status", {})
-            .get("flags", {})
-            .get("is_airkare_active")
-        )
+        return self._snapshot.airkare_active
 
     def get_power_status(self) -> str:
         """Get the status of the power."""
-        return self._device_info.get("status", {}).get("commands", {}).get("power")
+        return self._snapshot.power
 
     def get_relax_status(self) -> str:
         """Get the status of the relax."""
-        return (
-            self._device_info.get("status", {}).get("flags", {}).get("is_relax_active")
-        )
+        return self._snapshot.relax_active
 
     def get_target_temperature(self) -> str:
         """Get the target temperature."""
-        return (
-            self._device_info.get("nvm", {})
-            .get("user_parameters", {})
-            .get("enviroment_1_temperature")
-        )
+        return self._snapshot.target_temperature
 
     def get_chrono_mode_status(self) -> str:
         """Get the status of the chrono mode."""
-        return self._device_info.get("nvm", {}).get("chrono", {}).get("is_active")
+        return self._snapshot.chrono_active
 
     def get_operational_phase(self) -> str:
         """Get the operational phase."""
-        return (
-            self._device_info.get("status", {})
-            .get("state", {})
-            .get("operational_phase")
-        )
+        return self._snapshot.operational_phase
 
     def get_autonomy_second(self) -> str | None:
         """Get the autonomy time."""
-        return (
-            self._device_info.get("status", {})
-            .get("pellet", {})
-            .get("autonomy_time", None)
-        )
+        return self._snapshot.autonomy_time
 
     def get_standby_mode(self) -> bool:
         """Get standby mode."""
-        return (
-            self._device_info.get("nvm", {})
-            .get("user_parameters", {})
-            .get("is_standby_active", False)
-        )
+        return self._snapshot.standby_active
 
     def get_standby_waiting_time(self) -> str | None:
         """Get standby waiting time."""
-        return (
-            self._device_info.get("nvm", {})
-            .get("user_parameters", {})
-            .get("standby_waiting_time", None)
-        )
+        return self._snapshot.standby_waiting_time
 
     def get_power_ons(self) -> str | None:
         """Get the number of power ons."""
-        return (
-            self._device_info.get("nvm", {})
-            .get("total_counters", {})
-            .get("power_ons", None)
-        )
+        return self._snapshot.power_ons
+
+    def get_counters(self) -> dict[str, float]:
+        """Get the total counters of the device, by field."""
+        return self._snapshot.counters
+
+    def get_counter(self, key: str) -> float | None:
+        """Get a total counter of the device."""
+        return self._snapshot.counters.get(key)
 
     def is_auto(self) -> bool:
         """Check if the device is in auto mode."""
-        return (
-            self._device_info.get("nvm", {})
-            .get("user_parameters", {})
-            .get("is_auto", False)
-        )
+        return self._snapshot.is_auto
+
+    def get_pellet_consumption(self) -> float | None:
+        """Get the average pellet consumption, in kg/h."""
+        return self._pellet.consumption
+
+    def get_pellet_left(self) -> float | None:
+        """Get the estimated pellet left, in kg."""
+        return self._pellet.pellet_left
+
+    def get_pellet_empty(self) -> datetime | None:
+        """Get when the pellet is predicted to run out."""
+        return self._pellet.predicted_empty()
 
     def get_manual_power(self):
         """Get the manual mode."""
-        return (
-            self._device_info.get("nvm", {})
-            .get("user_parameters", {})
-            .get("manual_power")
-        )
+        return self._snapshot.manual_power
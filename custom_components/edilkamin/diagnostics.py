@@ -0,0 +1,45 @@
+"""Diagnostics support for Edilkamin."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from .const import DATA_API, DATA_COORDINATOR, DOMAIN, MAC_ADDRESS, PASSWORD, USERNAME
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+TO_REDACT = {MAC_ADDRESS, USERNAME, PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the diagnostics of a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    api = entry_data[DATA_API]
+    coordinator = entry_data[DATA_COORDINATOR]
+    circuit_breaker = api.circuit_breaker
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "device_info": async_redact_data(coordinator.data or {}, TO_REDACT),
+        "update_interval": str(coordinator.update_interval),
+        "metrics": {
+            "coordinator": coordinator.metrics.as_dict(),
+            "api": api.metrics.as_dict(),
+            "account": api.account.metrics.as_dict(),
+        },
+        "command_queue": api.get_command_queue_stats(),
+        "circuit_breaker": {
+            "state": circuit_breaker.state,
+            "failures": circuit_breaker.failures,
+            "rejected": circuit_breaker.rejected,
+        },
+    }
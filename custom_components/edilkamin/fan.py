@@ -18,7 +18,8 @@ from custom_components.edilkamin.api.edilkamin_async_api import (
     HttpError,
 )
 
-from .const import DOMAIN
+from .const import DATA_API, DATA_COORDINATOR, DOMAIN
+from .snapshot import PATH_POWER, fan_speed_path
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,8 +28,9 @@ SPEED_RANGE = (1, 5)  # away is not included in speeds and instead mapped to off
 
 async def async_setup_entry(hass, config_entry, async_add_devices):
     """Add sensors for passed config_entry in HA."""
-    async_api = hass.data[DOMAIN][config_entry.entry_id]
-    coordinator = hass.data[DOMAIN]["coordinator"]
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    async_api = entry_data[DATA_API]
+    coordinator = entry_data[DATA_COORDINATOR]
 
     nb_fans = coordinator.get_nb_fans()
 
@@ -48,7 +50,9 @@ class EdilkaminFan(CoordinatorEntity, FanEntity):
 
     def __init__(self, api: EdilkaminAsyncApi, index: int, coordinator) -> None:
         """Initialize the fan."""
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator, context=frozenset({PATH_POWER, fan_speed_path(index)})
+        )
         self._api = api
         self._mac_address = self.coordinator.get_mac_address()
         self._index = index
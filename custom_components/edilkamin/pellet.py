@@ -0,0 +1,129 @@
+"""Streaming estimation of the pellet consumption and refills."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+import math
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import DEFAULT_PELLET_CONSUMPTION
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from .snapshot import EdilkaminSnapshot
+
+PHASE_ON = 2
+
+# Time constant, in seconds, of the average consumption, idle time included
+CONSUMPTION_TIME_CONSTANT = 24 * 3600
+# Longer gaps between samples (restart, outage) are not averaged in
+MAX_SAMPLE_GAP = 3600
+# Increase of the pellet left, in kg, counted as a refill
+REFILL_MIN_PELLET = 1.0
+
+
+@dataclass(slots=True)
+class PelletEstimator:
+    """Estimate the pellet consumption and the pellet left from the samples.
+
+    The state is a handful of values: the average consumption is an
+    exponentially weighted average over time, updated with each sample.
+    """
+
+    # Average consumption, in kg/h
+    consumption: float | None = None
+    # Pellet left, in kg, and the power level it was estimated at
+    pellet_left: float | None = None
+    pellet_left_power: int | None = None
+    last_timestamp: float | None = None
+    last_rate: float = 0.0
+    last_power: int | None = None
+    last_in_reserve: bool | None = None
+
+    def add_sample(
+        self,
+        timestamp: float,
+        snapshot: EdilkaminSnapshot,
+        consumption: Mapping[int, float] = DEFAULT_PELLET_CONSUMPTION,
+    ) -> float | None:
+        """Add a sample of the device state, taken at timestamp.
+
+        consumption is the pellet burnt, in kg/h, at each power level. Return
+        the pellet added, in kg (0 if unknown), when a refill is detected,
+        None otherwise.
+        """
+        phase = snapshot.operational_phase
+        power = snapshot.actual_power
+        autonomy = snapshot.autonomy_time
+        in_reserve = snapshot.pellet_in_reserve
+        if power:
+            self.last_power = power
+        rate = 0.0
+        if phase == PHASE_ON:
+            rate = consumption.get(power, 0.0)
+
+        if self.last_timestamp is not None:
+            elapsed = timestamp - self.last_timestamp
+            if 0 < elapsed <= MAX_SAMPLE_GAP:
+                # The previous rate is the one burning pellet since then
+                if self.consumption is None:
+                    self.consumption = self.last_rate
+                weight = 1 - math.exp(-elapsed / CONSUMPTION_TIME_CONSTANT)
+                self.consumption += weight * (self.last_rate - self.consumption)
+        self.last_timestamp = timestamp
+        self.last_rate = rate
+
+        # The stove computes the autonomy at its power level
+        pellet_left = None
+        level_rate = consumption.get(self.last_power)
+        if autonomy is not None and level_rate is not None:
+            pellet_left = autonomy / 3600 * level_rate
+
+        refill = self._detect_refill(pellet_left, in_reserve=in_reserve)
+        if pellet_left is not None:
+            self.pellet_left = pellet_left
+            self.pellet_left_power = self.last_power
+        if in_reserve is not None:
+            self.last_in_reserve = in_reserve
+        return refill
+
+    def _detect_refill(
+        self, pellet_left: float | None, *, in_reserve: bool | None
+    ) -> float | None:
+        """Return the pellet added since the last sample, None without refill.
+
+        The consumption of a power level is only an estimate, so the pellet
+        left is only compared at the same power level, the reserve flag
+        tells the refills across a change of power.
+        """
+        if (
+            pellet_left is not None
+            and self.pellet_left is not None
+            and self.pellet_left_power == self.last_power
+            and pellet_left - self.pellet_left >= REFILL_MIN_PELLET
+        ):
+            return round(pellet_left - self.pellet_left, 1)
+        if self.last_in_reserve and in_reserve is False:
+            return 0.0
+        return None
+
+    def predicted_empty(self) -> datetime | None:
+        """Return when the pellet runs out, at the average consumption."""
+        if not self.consumption or self.pellet_left is None:
+            return None
+        hours = self.pellet_left / self.consumption
+        empty = dt_util.utcnow() + timedelta(hours=hours)
+        return empty.replace(second=0, microsecond=0)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state, to be stored."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PelletEstimator:
+        """Restore a stored state."""
+        return cls(**{key: data[key] for key in cls.__slots__ if key in data})
@@ -2,24 +2,42 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 import logging
-import time
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import EntityCategory, UnitOfTemperature, UnitOfTime
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DATA_COORDINATOR, DOMAIN
+from .snapshot import (
+    PATH_ACTUAL_POWER,
+    PATH_ALARMS_INDEX,
+    PATH_AUTONOMY,
+    PATH_OPERATIONAL_PHASE,
+    PATH_PELLET_IN_RESERVE,
+    PATH_TEMPERATURE,
+    counter_path,
+    fan_speed_path,
+)
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.typing import StateType
+
+    from custom_components.edilkamin.api.metrics import Metrics
+
+    from .coordinator import EdilkaminCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,319 +53,332 @@ OPERATIONAL_STATES = {
 }
 
 
+def operational_state(phase: int | None) -> str:
+    """Return the name of an operational phase."""
+    # Error operational code unknown, the code is in the value attribute
+    return OPERATIONAL_STATES.get(phase, OPERATIONAL_STATES[7])
+
+
+def seconds_to_minutes(seconds: int | None) -> int | None:
+    """Convert a duration in seconds to whole minutes."""
+    return None if seconds is None else seconds // 60
+
+
+@dataclass(frozen=True, kw_only=True)
+class EdilkaminSensorEntityDescription(SensorEntityDescription):
+    """Description of a sensor of a field of the device information.
+
+    The key is the suffix of the unique id. The value of the field at path
+    is converted by value_fn, and attributes_fn gives the attributes from
+    the coordinator and the value of the field.
+    """
+
+    path: tuple[str, ...]
+    value_fn: Callable[[Any], StateType] = lambda value: value
+    attributes_fn: Callable[[EdilkaminCoordinator, Any], dict[str, Any]] | None = None
+
+
+SENSOR_DESCRIPTIONS = (
+    EdilkaminSensorEntityDescription(
+        key="temperature",
+        name="Temperature",
+        icon="mdi:thermometer",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        path=PATH_TEMPERATURE,
+    ),
+    EdilkaminSensorEntityDescription(
+        key="nb_alarms_sensor",
+        name="Nb alarms",
+        icon="mdi:alert",
+        path=PATH_ALARMS_INDEX,
+        value_fn=lambda index: index or 0,
+        attributes_fn=lambda coordinator, _index: {
+            "errors": coordinator.get_recent_alarms()
+        },
+    ),
+    EdilkaminSensorEntityDescription(
+        key="actual_power",
+        name="Actual power",
+        icon="mdi:flash",
+        path=PATH_ACTUAL_POWER,
+    ),
+    EdilkaminSensorEntityDescription(
+        key="operational_phase_sensor",
+        name="Operational phase",
+        icon="mdi:eye",
+        device_class=SensorDeviceClass.ENUM,
+        options=list(OPERATIONAL_STATES.values()),
+        path=PATH_OPERATIONAL_PHASE,
+        value_fn=operational_state,
+        attributes_fn=lambda _coordinator, phase: {"value": phase},
+    ),
+    EdilkaminSensorEntityDescription(
+        key="autonomy",
+        name="Autonomy",
+        icon="mdi:timer",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        path=PATH_AUTONOMY,
+        value_fn=seconds_to_minutes,
+        attributes_fn=lambda _coordinator, _seconds: {
+            "description": "Time remaining before the stove turns off"
+            " if no pellets are added"
+        },
+    ),
+)
+
+
+def fan_description(index: int) -> EdilkaminSensorEntityDescription:
+    """Return the description of the speed of a fan."""
+    return EdilkaminSensorEntityDescription(
+        key=f"fan{index}_sensor",
+        name=f"Fan {index}",
+        icon="mdi:fan",
+        path=fan_speed_path(index),
+    )
+
+
+def counter_description(
+    key: str,
+    name: str | None = None,
+    icon: str = "mdi:counter",
+    unit: str | None = None,
+) -> EdilkaminSensorEntityDescription:
+    """Return the description of a total counter, a duration if it has a unit."""
+    return EdilkaminSensorEntityDescription(
+        key=key,
+        name=name or key.replace("_", " ").capitalize(),
+        icon=icon,
+        device_class=SensorDeviceClass.DURATION if unit else None,
+        native_unit_of_measurement=unit,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        path=counter_path(key),
+    )
+
+
+# Known total counters of the device, keyed by field
+COUNTER_DESCRIPTIONS = {
+    description.key: description
+    for description in (
+        counter_description("power_ons", "Power ons"),
+        *(
+            counter_description(
+                f"p{level}_working_time",
+                f"Working time power {level}",
+                "mdi:timer-cog-outline",
+                UnitOfTime.HOURS,
+            )
+            for level in range(1, 6)
+        ),
+        counter_description(
+            "service_time", "Service time", "mdi:wrench-clock", UnitOfTime.HOURS
+        ),
+    )
+}
+
+# Calls with diagnostic sensors, and the name of their sensors
+METRIC_CALLS = {
+    "device_info": "Device info requests",
+    "mqtt_command": "Command requests",
+    "sign_in": "Sign ins",
+    "token_refresh": "Token refreshes",
+    "update": "Updates",
+}
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
-    _config_entry: ConfigEntry,
+    config_entry: ConfigEntry,
     async_add_devices: AddEntitiesCallback,
 ):
     """Add sensors for passed config_entry in HA."""
 
-    coordinator = hass.data[DOMAIN]["coordinator"]
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][DATA_COORDINATOR]
+
+    descriptions = [*SENSOR_DESCRIPTIONS]
+    descriptions.extend(
+        fan_description(index)
+        for index in range(1, max(coordinator.get_nb_fans(), 1) + 1)
+    )
+    # Counters the device reports, the known ones until it reported any
+    descriptions.extend(
+        COUNTER_DESCRIPTIONS.get(key) or counter_description(key)
+        for key in coordinator.get_counters() or COUNTER_DESCRIPTIONS
+    )
 
     sensors = [
-        EdilkaminTemperatureSensor(coordinator),
-        EdilkaminFanSensor(coordinator, 1),
-        EdilkaminAlarmSensor(coordinator),
-        EdilkaminActualPowerSensor(coordinator),
-        EdilkaminOperationalSensor(coordinator),
-        EdilkaminAutonomySensor(coordinator),
-        EdilkaminPowerOnsSensor(coordinator),
+        EdilkaminSensor(coordinator, description) for description in descriptions
     ]
-
-    nb_fans = coordinator.get_nb_fans()
-
-    if nb_fans > 1:
-        sensors.extend(
-            EdilkaminFanSensor(coordinator, i) for i in range(2, nb_fans + 1)
-        )
+    sensors.append(EdilkaminPelletConsumptionSensor(coordinator))
+    sensors.append(EdilkaminPelletEmptySensor(coordinator))
+
+    api = coordinator.api
+    metrics = {
+        "device_info": api.metrics,
+        "mqtt_command": api.metrics,
+        "sign_in": api.account.metrics,
+        "token_refresh": api.account.metrics,
+        "update": coordinator.metrics,
+    }
+    for call, source in metrics.items():
+        sensors.append(EdilkaminCallCountSensor(coordinator, source, call))
+        sensors.append(EdilkaminCallLatencySensor(coordinator, source, call))
 
     async_add_devices(sensors)
 
 
-class EdilkaminTemperatureSensor(CoordinatorEntity, SensorEntity):
-    """Representation of a Sensor."""
-
-    def __init__(self, coordinator) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._state = None
-        self._mac_address = self.coordinator.get_mac_address()
-
-        self._attr_name = "Temperature"
-        self._attr_device_info = {"identifiers": {("edilkamin", self._mac_address)}}
-        self._attr_icon = "mdi:thermometer"
-
-    @property
-    def device_class(self):
-        """Return the class of this device, from component DEVICE_CLASSES."""
-        return SensorDeviceClass.TEMPERATURE
-
-    @property
-    def native_unit_of_measurement(self):
-        """Return the class of this device, from component DEVICE_CLASSES."""
-        return UnitOfTemperature.CELSIUS
-
-    @property
-    def unique_id(self):
-        """Return a unique_id for this entity."""
-        return f"{self._mac_address}_temperature"
-
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        return self._state
-
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._state = self.coordinator.get_temperature()
-        self.async_write_ha_state()
+class EdilkaminSensor(CoordinatorEntity, SensorEntity):
+    """Representation of a sensor of a field of the device information."""
 
+    entity_description: EdilkaminSensorEntityDescription
 
-class EdilkaminFanSensor(CoordinatorEntity, SensorEntity):
-    """Representation of a Sensor."""
+    def __init__(
+        self, coordinator, description: EdilkaminSensorEntityDescription
+    ) -> None:
+        """Initialize the sensor.
 
-    def __init__(self, coordinator, index: int) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._state = None
+        It is only updated when its field changes.
+        """
+        super().__init__(coordinator, context=frozenset({description.path}))
+        self.entity_description = description
         self._mac_address = self.coordinator.get_mac_address()
-        self._attr_icon = "mdi:fan"
-        self._index = index
 
-        self._attr_name = f"Fan {index}"
+        self._attr_unique_id = f"{self._mac_address}_{description.key}"
         self._attr_device_info = {"identifiers": {("edilkamin", self._mac_address)}}
 
-    @property
-    def device_class(self):
-        """Return the class of this device, from component DEVICE_CLASSES."""
-        return SensorDeviceClass.POWER
-
-    @property
-    def unique_id(self):
-        """Return a unique_id for this entity."""
-        return f"{self._mac_address}_fan{self._index}_sensor"
-
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        return self._state
-
     def _handle_coordinator_update(self) -> None:
         """Fetch new state data for the sensor."""
-        self._state = self.coordinator.get_fan_speed(self._index)
+        description = self.entity_description
+        value = self.coordinator.snapshot.leaves.get(description.path)
+        self._attr_native_value = description.value_fn(value)
+        if description.attributes_fn is not None:
+            self._attr_extra_state_attributes = description.attributes_fn(
+                self.coordinator, value
+            )
         self.async_write_ha_state()
 
 
-class EdilkaminAlarmSensor(CoordinatorEntity, SensorEntity):
-    """Representation of a Sensor."""
-
-    def __init__(self, coordinator) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._state = None
-        self._mac_address = self.coordinator.get_mac_address()
-        self._attr_icon = "mdi:alert"
-        self._attributes: dict[str, Any] = {}
-
-        self._attr_name = "Nb alarms"
-        self._attr_device_info = {"identifiers": {("edilkamin", self._mac_address)}}
-
-    @property
-    def device_class(self):
-        """Return the class of this device, from component DEVICE_CLASSES."""
-        return SensorDeviceClass.POWER
-
-    @property
-    def unique_id(self):
-        """Return a unique_id for this entity."""
-        return f"{self._mac_address}_nb_alarms_sensor"
-
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        return self._state
-
-    @property
-    def extra_state_attributes(self) -> dict[str, str]:
-        """Return attributes for the sensor."""
-        return self._attributes
-
-    def _handle_coordinator_update(self) -> None:
-        """Fetch new state data for the sensor."""
-        self._state = self.coordinator.get_nb_alarms()
-        alarms = self.coordinator.get_alarms()
-
-        errors = {
-            "errors": [],
-        }
-
-        for alarm in alarms:
-            data = {
-                "type": alarm["type"],
-                "timestamp": time.strftime(
-                    "%d-%m-%Y %H:%M:%S", time.localtime(alarm["timestamp"])
-                ),
-            }
-            errors["errors"].append(data)
-
-        self._attributes = errors
-        self.async_write_ha_state()
+# Fields the pellet estimation depends on
+PELLET_PATHS = frozenset(
+    {PATH_ACTUAL_POWER, PATH_AUTONOMY, PATH_OPERATIONAL_PHASE, PATH_PELLET_IN_RESERVE}
+)
 
 
-class EdilkaminActualPowerSensor(CoordinatorEntity, SensorEntity):
+class EdilkaminPelletConsumptionSensor(CoordinatorEntity, SensorEntity):
     """Representation of a Sensor."""
 
+    _attr_icon = "mdi:fire"
+    _attr_native_unit_of_measurement = "kg/h"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 2
+
     def __init__(self, coordinator) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._state = None
+        super().__init__(coordinator, context=PELLET_PATHS)
         self._mac_address = self.coordinator.get_mac_address()
 
-        self._attr_name = "Actual power"
+        self._attr_name = "Pellet consumption"
+        self._attr_unique_id = f"{self._mac_address}_pellet_consumption"
         self._attr_device_info = {"identifiers": {("edilkamin", self._mac_address)}}
-        self._attr_icon = "mdi:flash"
-
-    @property
-    def device_class(self):
-        """Return the class of this device, from component DEVICE_CLASSES."""
-        return SensorDeviceClass.POWER
-
-    @property
-    def native_unit_of_measurement(self):
-        """Return the class of this device, from component DEVICE_CLASSES."""
-        return None
-
-    @property
-    def unique_id(self):
-        """Return a unique_id for this entity."""
-        return f"{self._mac_address}_actual_power"
-
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        return self._state
 
     def _handle_coordinator_update(self) -> None:
         """Fetch new state data for the sensor."""
-        self._state = self.coordinator.get_actual_power()
+        self._attr_native_value = self.coordinator.get_pellet_consumption()
+        self._attr_extra_state_attributes = {
+            "pellet_left": self.coordinator.get_pellet_left()
+        }
         self.async_write_ha_state()
 
 
-class EdilkaminOperationalSensor(CoordinatorEntity, SensorEntity):
+class EdilkaminPelletEmptySensor(CoordinatorEntity, SensorEntity):
     """Representation of a Sensor."""
 
+    _attr_icon = "mdi:storage-tank-outline"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+
     def __init__(self, coordinator) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._state = None
+        super().__init__(coordinator, context=PELLET_PATHS)
         self._mac_address = self.coordinator.get_mac_address()
-        self._attr_icon = "mdi:eye"
-        self._attributes: dict[str, Any] = {}
 
-        self._attr_name = "Operational phase"
-        self._attr_options = list(OPERATIONAL_STATES.values())
+        self._attr_name = "Pellet empty"
+        self._attr_unique_id = f"{self._mac_address}_pellet_empty"
         self._attr_device_info = {"identifiers": {("edilkamin", self._mac_address)}}
 
-    @property
-    def device_class(self):
-        """Return the class of this device, from component DEVICE_CLASSES."""
-        return SensorDeviceClass.ENUM
-
-    @property
-    def unique_id(self):
-        """Return a unique_id for this entity."""
-        return f"{self._mac_address}_operational_phase_sensor"
-
     def _handle_coordinator_update(self) -> None:
         """Fetch new state data for the sensor."""
-        op_state = self.coordinator.get_operational_phase()
+        self._attr_native_value = self.coordinator.get_pellet_empty()
+        self.async_write_ha_state()
 
-        if op_state in OPERATIONAL_STATES:
-            self._attr_native_value = OPERATIONAL_STATES[op_state]
-        else:
-            # Error operational code unknown, shows only the code
-            self._attr_native_value = OPERATIONAL_STATES[7]
 
-        additional_att = {"value": op_state}
-        self._attr_extra_state_attributes = additional_att
-        self.async_write_ha_state()
+class EdilkaminMetricSensor(CoordinatorEntity, SensorEntity):
+    """Representation of a diagnostic sensor of the calls to the cloud."""
 
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
 
-class EdilkaminAutonomySensor(CoordinatorEntity, SensorEntity):
-    """Representation of a Sensor."""
+    def __init__(self, coordinator, metrics: Metrics, call: str) -> None:
+        """Initialize the sensor.
 
-    def __init__(self, coordinator) -> None:
-        """Initialize the sensor."""
+        Without context, it is updated at every coordinator update.
+        """
         super().__init__(coordinator)
-        self._state = None
+        self._metrics = metrics
+        self._call = call
         self._mac_address = self.coordinator.get_mac_address()
-
-        self._attr_name = "Autonomy"
         self._attr_device_info = {"identifiers": {("edilkamin", self._mac_address)}}
-        self._attr_icon = "mdi:timer"
-
-        additional_att = {
-            "description": "Time remaining before the stove turns off"
-            " if no pellets are added"
-        }
-        self._attr_extra_state_attributes = additional_att
 
-    @property
-    def device_class(self):
-        """Return the class of this device, from component DEVICE_CLASSES."""
-        return SensorDeviceClass.DURATION
 
-    @property
-    def native_unit_of_measurement(self):
-        """Return the class of this device, from component DEVICE_CLASSES."""
-        return "min"
+class EdilkaminCallCountSensor(EdilkaminMetricSensor):
+    """Representation of a Sensor."""
 
-    @property
-    def unique_id(self):
-        """Return a unique_id for this entity."""
-        return f"{self._mac_address}_autonomy"
+    _attr_icon = "mdi:counter"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        return self._state
+    def __init__(self, coordinator, metrics: Metrics, call: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, metrics, call)
+        self._attr_name = METRIC_CALLS[call]
+        self._attr_unique_id = f"{self._mac_address}_{call}_calls"
 
     def _handle_coordinator_update(self) -> None:
         """Fetch new state data for the sensor."""
-        autonomy_second = self.coordinator.get_autonomy_second()
-        if autonomy_second is None:
-            return
-        # Convert seconds to minutes
-        minutes = divmod(autonomy_second, 60)
-        self._state = f"{minutes}"
+        metrics = self._metrics.get(self._call)
+        self._attr_native_value = metrics.calls
+        self._attr_extra_state_attributes = {
+            "errors": metrics.errors,
+            "error_rate": metrics.error_rate,
+        }
         self.async_write_ha_state()
 
 
-class EdilkaminPowerOnsSensor(CoordinatorEntity, SensorEntity):
+class EdilkaminCallLatencySensor(EdilkaminMetricSensor):
     """Representation of a Sensor."""
 
-    def __init__(self, coordinator) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._state = None
-        self._mac_address = self.coordinator.get_mac_address()
-
-        self._attr_name = "Power ons"
-        self._attr_device_info = {"identifiers": {("edilkamin", self._mac_address)}}
-        self._attr_icon = "mdi:counter"
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-
-    @property
-    def unique_id(self):
-        """Return a unique_id for this entity."""
-        return f"{self._mac_address}_power_ons"
+    _attr_icon = "mdi:timer-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        return self._state
+    def __init__(self, coordinator, metrics: Metrics, call: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, metrics, call)
+        self._attr_name = f"{METRIC_CALLS[call]} latency"
+        self._attr_unique_id = f"{self._mac_address}_{call}_latency"
 
     def _handle_coordinator_update(self) -> None:
-        """Fetch new state data for the sensor."""
-        self._state = self.coordinator.get_power_ons()
+        """Fetch new state data for the sensor, the average latency."""
+        metrics = self._metrics.get(self._call)
+        self._attr_native_value = to_milliseconds(metrics.average_latency)
+        self._attr_extra_state_attributes = {
+            "last": to_milliseconds(metrics.last_latency),
+            "max": to_milliseconds(metrics.max_latency),
+            "histogram": metrics.as_dict()["histogram"],
+        }
         self.async_write_ha_state()
+
+
+def to_milliseconds(seconds: float | None) -> int | None:
+    """Convert a duration in seconds to milliseconds."""
+    return None if seconds is None else round(seconds * 1000)
@@ -0,0 +1,161 @@
+"""Typed snapshot of the device information."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import logging
+import re
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Paths of the fields read by the entities, also used as listener contexts
+PATH_TEMPERATURE = ("status", "temperatures", "enviroment")
+PATH_ACTUAL_POWER = ("status", "state", "actual_power")
+PATH_OPERATIONAL_PHASE = ("status", "state", "operational_phase")
+PATH_POWER = ("status", "commands", "power")
+PATH_PELLET_IN_RESERVE = ("status", "flags", "is_pellet_in_reserve")
+PATH_AIRKARE = ("status", "flags", "is_airkare_active")
+PATH_RELAX = ("status", "flags", "is_relax_active")
+PATH_AUTONOMY = ("status", "pellet", "autonomy_time")
+PATH_TARGET_TEMPERATURE = ("nvm", "user_parameters", "enviroment_1_temperature")
+PATH_IS_AUTO = ("nvm", "user_parameters", "is_auto")
+PATH_MANUAL_POWER = ("nvm", "user_parameters", "manual_power")
+PATH_STANDBY = ("nvm", "user_parameters", "is_standby_active")
+PATH_STANDBY_WAITING_TIME = ("nvm", "user_parameters", "standby_waiting_time")
+PATH_NB_FANS = ("nvm", "installer_parameters", "fans_number")
+PATH_CHRONO = ("nvm", "chrono", "is_active")
+PATH_ALARMS_LOG = ("nvm", "alarms_log")
+PATH_ALARMS_INDEX = ("nvm", "alarms_log", "index")
+PATH_ALARMS = ("nvm", "alarms_log", "alarms")
+PATH_POWER_ONS = ("nvm", "total_counters", "power_ons")
+
+USER_PARAMETERS = ("nvm", "user_parameters")
+TOTAL_COUNTERS = ("nvm", "total_counters")
+FAN_SPEED_KEY = re.compile(r"fan_(\d+)_ventilation")
+
+# Top level sections every device information is expected to have
+SECTIONS = ("status", "nvm")
+
+
+def fan_speed_path(index: int) -> tuple[str, ...]:
+    """Return the path of the speed of a fan."""
+    return (*USER_PARAMETERS, f"fan_{index}_ventilation")
+
+
+def counter_path(key: str) -> tuple[str, ...]:
+    """Return the path of a total counter."""
+    return (*TOTAL_COUNTERS, key)
+
+
+def flatten_device_info(info: dict, prefix: tuple = ()) -> dict[tuple, Any]:
+    """Map the path of every leaf of the device information to its value."""
+    leaves = {}
+    for key, value in info.items():
+        path = (*prefix, key)
+        if isinstance(value, dict) and value:
+            leaves.update(flatten_device_info(value, path))
+        else:
+            leaves[path] = value
+    return leaves
+
+
+def changed_paths(old: dict[tuple, Any], new: dict[tuple, Any]) -> set[tuple]:
+    """Return the paths, and all their parents, whose value changed."""
+    changed = set()
+    for path in old.keys() | new.keys():
+        if old.get(path) != new.get(path) or (path in old) != (path in new):
+            changed.update(path[:length] for length in range(1, len(path) + 1))
+    return changed
+
+
+def is_number(value: Any) -> bool:
+    """Return whether value is a number, booleans excluded."""
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def check_schema(info: dict) -> None:
+    """Log the sections of the device information that are not as expected."""
+    for section in SECTIONS:
+        value = info.get(section)
+        if value is None:
+            _LOGGER.debug("Device information has no %s section", section)
+        elif not isinstance(value, dict):
+            _LOGGER.warning(
+                "Device information %s section is a %s, the API may have changed",
+                section,
+                type(value).__name__,
+            )
+
+
+@dataclass(slots=True, frozen=True)
+class EdilkaminSnapshot:
+    """Values of a device information, extracted once when it is received."""
+
+    device_info: dict = field(default_factory=dict)
+    leaves: dict[tuple, Any] = field(default_factory=dict)
+
+    temperature: float | None = None
+    target_temperature: float | None = None
+    fan_speeds: dict[int, Any] = field(default_factory=dict)
+    nb_fans: int = 0
+    nb_alarms: int = 0
+    alarms: list = field(default_factory=list)
+    actual_power: int | None = None
+    pellet_in_reserve: bool | None = None
+    airkare_active: bool | None = None
+    power: bool | None = None
+    relax_active: bool | None = None
+    chrono_active: bool | None = None
+    operational_phase: int | None = None
+    autonomy_time: int | None = None
+    standby_active: bool = False
+    standby_waiting_time: int | None = None
+    power_ons: int | None = None
+    counters: dict[str, float] = field(default_factory=dict)
+    is_auto: bool = False
+    manual_power: int | None = None
+
+    @classmethod
+    def from_device_info(cls, info: dict) -> EdilkaminSnapshot:
+        """Build the snapshot of a device information."""
+        check_schema(info)
+        leaves = flatten_device_info(info)
+
+        fan_speeds = {}
+        counters = {}
+        for path, value in leaves.items():
+            if path[:-1] == USER_PARAMETERS and (
+                match := FAN_SPEED_KEY.fullmatch(path[-1])
+            ):
+                fan_speeds[int(match.group(1))] = value
+            elif path[:-1] == TOTAL_COUNTERS and is_number(value):
+                counters[path[-1]] = value
+
+        nb_alarms = leaves.get(PATH_ALARMS_INDEX, 0)
+        alarms = leaves.get(PATH_ALARMS) or []
+
+        return cls(
+            device_info=info,
+            leaves=leaves,
+            temperature=leaves.get(PATH_TEMPERATURE),
+            target_temperature=leaves.get(PATH_TARGET_TEMPERATURE),
+            fan_speeds=fan_speeds,
+            nb_fans=leaves.get(PATH_NB_FANS, 0),
+            nb_alarms=nb_alarms,
+            alarms=alarms[: min(nb_alarms or 0, len(alarms))],
+            actual_power=leaves.get(PATH_ACTUAL_POWER),
+            pellet_in_reserve=leaves.get(PATH_PELLET_IN_RESERVE),
+            airkare_active=leaves.get(PATH_AIRKARE),
+            power=leaves.get(PATH_POWER),
+            relax_active=leaves.get(PATH_RELAX),
+            chrono_active=leaves.get(PATH_CHRONO),
+            operational_phase=leaves.get(PATH_OPERATIONAL_PHASE),
+            autonomy_time=leaves.get(PATH_AUTONOMY),
+            standby_active=leaves.get(PATH_STANDBY, False),
+            standby_waiting_time=leaves.get(PATH_STANDBY_WAITING_TIME),
+            power_ons=leaves.get(PATH_POWER_ONS),
+            counters=counters,
+            is_auto=leaves.get(PATH_IS_AUTO, False),
+            manual_power=leaves.get(PATH_MANUAL_POWER),
+        )
@@ -0,0 +1,190 @@
+"""Hourly long-term statistics of the device."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+)
+from homeassistant.const import UnitOfTemperature
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+from .snapshot import PATH_ACTUAL_POWER, PATH_TEMPERATURE, is_number
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .coordinator import EdilkaminCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fields averaged over the hour: path, name and unit
+MEAN_FIELDS = {
+    "temperature": (PATH_TEMPERATURE, "Temperature", UnitOfTemperature.CELSIUS),
+    "actual_power": (PATH_ACTUAL_POWER, "Actual power", None),
+}
+HOUR = timedelta(hours=1)
+
+
+@dataclass(slots=True)
+class TimeWeightedMean:
+    """Minimum, maximum and time weighted mean of a value over an hour.
+
+    The value holds until the next sample, so a value reported once for
+    the whole hour weighs as much as one reported at every poll.
+    """
+
+    value: float | None = None
+    since: datetime | None = None
+    minimum: float | None = None
+    maximum: float | None = None
+    weighted_sum: float = 0.0
+    duration: float = 0.0
+
+    def add(self, now: datetime, value: float | None) -> None:
+        """Add a sample of the value, taken at now."""
+        self._hold(now)
+        self.value = value
+        self.since = now
+        if value is not None:
+            self.minimum = value if self.minimum is None else min(self.minimum, value)
+            self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    def close(self, end: datetime) -> tuple[float, float, float] | None:
+        """Return the minimum, maximum and mean until end, and start over.
+
+        Return None if the value was unknown the whole time.
+        """
+        self._hold(end)
+        result = None
+        if self.duration:
+            result = (self.minimum, self.maximum, self.weighted_sum / self.duration)
+        # The current value carries over to the next hour
+        self.minimum = self.maximum = self.value
+        self.weighted_sum = self.duration = 0.0
+        return result
+
+    def _hold(self, now: datetime) -> None:
+        """Weigh the current value by the time it held until now."""
+        if self.value is not None and self.since is not None and now > self.since:
+            held = (now - self.since).total_seconds()
+            self.weighted_sum += self.value * held
+            self.duration += held
+        self.since = now
+
+
+def to_number(value: Any) -> float | None:
+    """Return value as a number, None if it is not one."""
+    return value if is_number(value) else None
+
+
+class EdilkaminStatistics:
+    """Import hourly aggregates of the device into the long-term statistics.
+
+    The aggregates are built from the coordinator updates as they come,
+    with constant memory, and imported once the hour is over. The raw
+    states of the entities can then be excluded from the recorder.
+
+    The counters are left out: their sensors are total increasing, so the
+    recorder already keeps their long-term statistics.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: EdilkaminCoordinator) -> None:
+        """Initialize the statistics of the device of the coordinator."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._object_id = slugify(coordinator.get_mac_address())
+        self._means = {key: TimeWeightedMean() for key in MEAN_FIELDS}
+        self._hour_start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+
+    def statistic_id(self, key: str) -> str:
+        """Return the id of the statistic of a field."""
+        return f"{DOMAIN}:{self._object_id}_{slugify(key)}"
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Start following the coordinator, return a callable that stops."""
+        remove_listener = self._coordinator.async_add_listener(
+            self._async_handle_update,
+            frozenset(path for path, _name, _unit in MEAN_FIELDS.values()),
+        )
+        remove_timer = async_track_utc_time_change(
+            self._hass, self._async_hour_changed, minute=0, second=0
+        )
+
+        def stop() -> None:
+            remove_listener()
+            remove_timer()
+
+        return stop
+
+    @callback
+    def _async_handle_update(self) -> None:
+        """Add the values of the coordinator to the aggregates."""
+        self.add_sample(dt_util.utcnow())
+
+    def add_sample(self, now: datetime) -> None:
+        """Add the current values of the device, taken at now."""
+        leaves = self._coordinator.snapshot.leaves
+        for key, (path, _name, _unit) in MEAN_FIELDS.items():
+            self._means[key].add(now, to_number(leaves.get(path)))
+
+    @callback
+    def _async_hour_changed(self, now: datetime) -> None:
+        """Import the statistics of the hour that just ended."""
+        self.async_import(
+            dt_util.as_utc(now).replace(minute=0, second=0, microsecond=0)
+        )
+
+    @callback
+    def async_import(self, end: datetime) -> None:
+        """Import the statistics of the hour before end, if not done yet."""
+        start = self._hour_start
+        if end <= start:
+            return
+        self._hour_start = end
+        # Only whole hours can be imported, the first one may be partial
+        start = end - HOUR
+        if "recorder" not in self._hass.config.components:
+            for mean in self._means.values():
+                mean.close(end)
+            return
+
+        for key, (_path, name, unit) in MEAN_FIELDS.items():
+            result = self._means[key].close(end)
+            if result is None:
+                continue
+            minimum, maximum, mean = result
+            self._add_statistics(
+                key,
+                name,
+                unit,
+                StatisticData(start=start, min=minimum, max=maximum, mean=mean),
+            )
+
+    def _add_statistics(
+        self, key: str, name: str, unit: str | None, data: StatisticData
+    ) -> None:
+        """Import the statistics of one field for an hour."""
+        metadata = StatisticMetaData(
+            mean_type=StatisticMeanType.ARITHMETIC,
+            has_sum=False,
+            name=f"Edilkamin {self._coordinator.get_mac_address()} {name.lower()}",
+            source=DOMAIN,
+            statistic_id=self.statistic_id(key),
+            unit_of_measurement=unit,
+        )
+        _LOGGER.debug("Import statistics %s: %s", metadata["statistic_id"], data)
+        async_add_external_statistics(self._hass, metadata, [data])
@@ -14,7 +14,8 @@ from custom_components.edilkamin.api.edilkamin_async_api import (
     NotInRightStateError,
 )
 
-from .const import DOMAIN
+from .const import DATA_API, DATA_COORDINATOR, DOMAIN
+from .snapshot import PATH_AIRKARE, PATH_CHRONO, PATH_RELAX, PATH_STANDBY
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -24,8 +25,9 @@ _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_devices):
     """Add sensors for passed config_entry in HA."""
-    async_api = hass.data[DOMAIN][config_entry.entry_id]
-    coordinator = hass.data[DOMAIN]["coordinator"]
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    async_api = entry_data[DATA_API]
+    coordinator = entry_data[DATA_COORDINATOR]
 
     async_add_devices(
         [
@@ -42,7 +44,7 @@ class EdilkaminAirekareSwitch(CoordinatorEntity, SwitchEntity):
 
     def __init__(self, api: EdilkaminAsyncApi, coordinator) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=frozenset({PATH_AIRKARE}))
         self._state = None
         self._api = api
         self._mac_address = self.coordinator.get_mac_address()
@@ -64,12 +66,10 @@ class EdilkaminAirekareSwitch(CoordinatorEntity, SwitchEntity):
     async def async_turn_on(self, **_kwargs) -> None:
         """Turn the entity on."""
         await self._api.enable_airkare()
-        await self.coordinator.async_refresh()
 
     async def async_turn_off(self, **_kwargs):
         """Turn the entity off."""
         await self._api.disable_airkare()
-        await self.coordinator.async_refresh()
 
 
 class EdilkaminRelaxSwitch(CoordinatorEntity, SwitchEntity):
@@ -77,7 +77,7 @@ class EdilkaminRelaxSwitch(CoordinatorEntity, SwitchEntity):
 
     def __init__(self, api: EdilkaminAsyncApi, coordinator) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=frozenset({PATH_RELAX}))
         self._state = None
         self._api = api
         self._mac_address = self.coordinator.get_mac_address()
@@ -99,12 +99,10 @@ class EdilkaminRelaxSwitch(CoordinatorEntity, SwitchEntity):
     async def async_turn_on(self, **_kwargs) -> None:
         """Turn the entity on."""
         await self._api.enable_relax()
-        await self.coordinator.async_refresh()
 
     async def async_turn_off(self, **_kwargs):
         """Turn the entity off."""
         await self._api.disable_relax()
-        await self.coordinator.async_refresh()
 
 
 class EdilkaminChronoModeSwitch(CoordinatorEntity, SwitchEntity):
@@ -112,7 +110,7 @@ class EdilkaminChronoModeSwitch(CoordinatorEntity, SwitchEntity):
 
     def __init__(self, api: EdilkaminAsyncApi, coordinator) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=frozenset({PATH_CHRONO}))
         self._state = None
         self._api = api
         self._mac_address = self.coordinator.get_mac_address()
@@ -134,12 +132,10 @@ class EdilkaminChronoModeSwitch(CoordinatorEntity, SwitchEntity):
     async def async_turn_on(self, **_kwargs) -> None:
         """Turn the entity on."""
         await self._api.enable_chrono_mode()
-        await self.coordinator.async_refresh()
 
     async def async_turn_off(self, **_kwargs):
         """Turn the entity off."""
         await self._api.disable_chrono_mode()
-        await self.coordinator.async_refresh()
 
 
 class EdilkaminStandByModeSwitch(CoordinatorEntity, SwitchEntity):
@@ -147,7 +143,7 @@ class EdilkaminStandByModeSwitch(CoordinatorEntity, SwitchEntity):
 
     def __init__(self, api: EdilkaminAsyncApi, coordinator) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=frozenset({PATH_STANDBY}))
         self._state = None
         self._api = api
         self._mac_address = self.coordinator.get_mac_address()
@@ -186,20 +182,22 @@ class EdilkaminStandByModeSwitch(CoordinatorEntity, SwitchEntity):
     async def async_turn_on(self, **_kwargs) -> None:
         """Turn the entity on."""
         try:
-            await self._api.enable_standby_mode()
-            await self.coordinator.async_refresh()
+            await self._api.enable_standby_mode(
+                is_auto=await self.coordinator.async_is_auto()
+            )
         except NotInRightStateError as e:
             _LOGGER.warning(e)
-            self._attr_is_on = False
-            await self.coordinator.async_refresh()
+            # Nothing was sent, put the switch back to the known state
+            self.async_write_ha_state()
             raise HomeAssistantError(e) from e
 
     async def async_turn_off(self, **_kwargs):
         """Turn the entity off."""
         try:
-            await self._api.disable_standby_mode()
-            await self.coordinator.async_refresh()
+            await self._api.disable_standby_mode(
+                is_auto=await self.coordinator.async_is_auto()
+            )
         except NotInRightStateError as e:
             _LOGGER.warning(e)
-            self._attr_is_on = True
-            await self.coordinator.async_refresh()
+            # Nothing was sent, put the switch back to the known state
+            self.async_write_ha_state()
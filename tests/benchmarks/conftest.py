@@ -0,0 +1,91 @@
+"""Fixtures of the benchmarks, run against a stubbed transport."""
+
+import asyncio
+import copy
+from unittest.mock import Mock
+
+import pytest
+
+from custom_components.edilkamin.api.edilkamin_account import EdilkaminAccount
+from custom_components.edilkamin.api.edilkamin_async_api import EdilkaminAsyncApi
+from custom_components.edilkamin.api.edilkamin_http_client import EdilkaminHttpClient
+from custom_components.edilkamin.coordinator import EdilkaminCoordinator
+from tests.conftest import MAC_ADDRESS
+from tests.fake_edilkamin_cloud import FakeStove
+
+
+def large_device_info(extra_fields=2000, alarms=100) -> dict:
+    """Build a device information as big as the real one, or bigger."""
+    stove = FakeStove(
+        MAC_ADDRESS,
+        power=True,
+        phase=2,
+        fans={1: 3, 2: 2, 3: 1},
+        alarms=[{"type": i % 20, "timestamp": 1700000000 + i} for i in range(alarms)],
+    )
+    info = stove.device_info()
+    info["nvm"]["installer_parameters"].update(
+        {f"parameter_{i}": i for i in range(extra_fields)}
+    )
+    return info
+
+
+class StubHttpClient(EdilkaminHttpClient):
+    """HTTP client answering from memory, the decoding still runs."""
+
+    def __init__(self, device_info: dict) -> None:
+        super().__init__(Mock())
+        self.device_info_payload = device_info
+
+    async def _request(self, method, *_args, **_kwargs):
+        if method == "GET":
+            return copy.deepcopy(self.device_info_payload)
+        return "Command 00000000 executed successfully"
+
+
+class BenchHass:
+    """Just enough of Home Assistant for the API and the coordinator."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+
+    async def async_add_executor_job(self, func, *args):
+        return func(*args)
+
+    def async_create_background_task(self, target, name):
+        return self.loop.create_task(target, name=name)
+
+    def async_create_task(self, target):
+        target.close()
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def device_info():
+    return large_device_info()
+
+
+@pytest.fixture
+def api(loop, device_info):
+    hass = BenchHass(loop)
+    account = EdilkaminAccount(hass, "user", "pass", client=StubHttpClient(device_info))
+    account._token = "token"  # noqa: S105
+    api = EdilkaminAsyncApi(MAC_ADDRESS, "user", "pass", hass, account=account)
+    # Measure the API, not the coalescing window
+    api._command_queue._window = 0
+    return api
+
+
+@pytest.fixture
+def coordinator(api):
+    hass = Mock()
+    hass.async_create_task = Mock(side_effect=lambda coro: coro.close())
+    coordinator = EdilkaminCoordinator(hass, api)
+    coordinator._schedule_refresh = Mock()
+    return coordinator
@@ -0,0 +1,123 @@
+"""Benchmarks of the coordinator hot path.
+
+Run them with `uv run pytest tests/benchmarks --benchmark-enable`, see the
+testing guide to store and compare the results.
+"""
+
+import itertools
+from unittest.mock import Mock, patch
+
+import pytest
+
+from custom_components.edilkamin import climate, fan, sensor, switch
+from custom_components.edilkamin.binary_sensor import EdilkaminTankBinarySensor
+from custom_components.edilkamin.const import DATA_API, DATA_COORDINATOR, DOMAIN
+from custom_components.edilkamin.snapshot import EdilkaminSnapshot
+
+from .conftest import large_device_info
+
+
+def test_update_data(benchmark, loop, coordinator):
+    """Fetch, decode and snapshot the device information, end to end."""
+    # The token is valid, no sign in is measured
+    with patch(
+        "custom_components.edilkamin.api.edilkamin_account.is_token_expired",
+        return_value=False,
+    ):
+        info = benchmark(
+            lambda: loop.run_until_complete(coordinator._async_update_data())
+        )
+
+    assert info["nvm"]["installer_parameters"]["fans_number"] == 3
+
+
+async def create_entities(coordinator):
+    """Create the entities of every platform, as Home Assistant would."""
+    entry = Mock(entry_id="entry", options={})
+    hass = Mock()
+    hass.data = {
+        DOMAIN: {"entry": {DATA_API: coordinator.api, DATA_COORDINATOR: coordinator}}
+    }
+    entities = [EdilkaminTankBinarySensor(coordinator)]
+    for platform in (climate, fan, sensor, switch):
+        await platform.async_setup_entry(hass, entry, entities.extend)
+    for entity in entities:
+        entity.async_write_ha_state = Mock()
+        coordinator.async_add_listener(
+            entity._handle_coordinator_update, entity.coordinator_context
+        )
+    return entities
+
+
+@pytest.mark.parametrize("changed", ["everything", "temperature"])
+def test_entity_fan_out(benchmark, loop, coordinator, device_info, changed):
+    """Notify the entities of a new device information."""
+    coordinator._set_device_info(device_info)
+    coordinator.data = coordinator._device_info
+    entities = loop.run_until_complete(create_entities(coordinator))
+    # Only the temperature differs between consecutive device informations
+    warmer = large_device_info()
+    warmer["status"]["temperatures"]["enviroment"] += 1
+    infos = itertools.cycle([warmer, device_info])
+
+    def update():
+        if changed == "everything":
+            coordinator._changed_paths = None
+        else:
+            coordinator._set_device_info(next(infos))
+        coordinator.async_update_listeners()
+
+    benchmark(update)
+
+    assert len(entities) >= 15
+
+
+def test_snapshot_of_large_payload(benchmark, device_info):
+    """Build the snapshot of a large device information."""
+    snapshot = benchmark(EdilkaminSnapshot.from_device_info, device_info)
+
+    assert snapshot.nb_alarms == 100
+
+
+def test_getters(benchmark, coordinator, device_info):
+    """Read every value the entities read."""
+    coordinator._set_device_info(device_info)
+
+    def read():
+        return (
+            coordinator.get_temperature(),
+            coordinator.get_target_temperature(),
+            [coordinator.get_fan_speed(i) for i in range(1, 4)],
+            coordinator.get_nb_fans(),
+            coordinator.get_alarms(),
+            coordinator.get_actual_power(),
+            coordinator.get_status_tank(),
+            coordinator.get_airkare_status(),
+            coordinator.get_power_status(),
+            coordinator.get_relax_status(),
+            coordinator.get_chrono_mode_status(),
+            coordinator.get_operational_phase(),
+            coordinator.get_autonomy_second(),
+            coordinator.get_standby_mode(),
+            coordinator.get_power_ons(),
+            coordinator.is_auto(),
+            coordinator.get_manual_power(),
+        )
+
+    values = benchmark(read)
+
+    assert values[0] == 18.0
+
+
+def test_execute_command(benchmark, loop, api):
+    """Send a command through the queue, the circuit breaker and the account."""
+    with patch(
+        "custom_components.edilkamin.api.edilkamin_account.is_token_expired",
+        return_value=False,
+    ):
+        result = benchmark(
+            lambda: loop.run_until_complete(api.set_fan_speed(3, index=2))
+        )
+
+    assert result is None
+    assert api.get_command_queue_stats()["commands_sent"] >= 1
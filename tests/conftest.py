@@ -0,0 +1,73 @@
+"""Helpers and fixtures shared by the tests."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import Mock
+
+import jwt
+import pytest
+
+from custom_components.edilkamin.api.edilkamin_async_api import EdilkaminAsyncApi
+from custom_components.edilkamin.coordinator import EdilkaminCoordinator
+
+MAC_ADDRESS = "00:11:22:33:44:55"
+
+
+class DummyHass:
+    """Run the executor jobs and the background tasks in the event loop."""
+
+    async def async_add_executor_job(self, func, *args, **kwargs):
+        # Yield to the loop so concurrent callers can pile up on the locks
+        await asyncio.sleep(0)
+        return func(*args, **kwargs)
+
+    def async_create_background_task(self, target, name):
+        return asyncio.get_running_loop().create_task(target, name=name)
+
+
+def make_token(exp_offset_sec=3600):
+    """Return a JWT token expiring in exp_offset_sec."""
+    exp = int((datetime.now(UTC) + timedelta(seconds=exp_offset_sec)).timestamp())
+    return jwt.encode({"exp": exp}, key="secret", algorithm="HS256")
+
+
+def make_api(hass, mac_address=MAC_ADDRESS, account=None):
+    """Return the API of a stove."""
+    return EdilkaminAsyncApi(
+        mac_address=mac_address,
+        username="test@example.com",
+        password="password",  # noqa: S106
+        hass=hass,
+        account=account,
+    )
+
+
+def make_coordinator(hass=None, options=None, store=None, pellet_store=None):
+    """Return the coordinator of a stove, its refreshes are never scheduled.
+
+    By default hass is a mock whose tasks, like the debounced refresh after
+    a command, are not run.
+    """
+    if hass is None:
+        hass = Mock()
+        hass.async_create_task = Mock(side_effect=lambda coro: coro.close())
+    coordinator = EdilkaminCoordinator(
+        hass=hass,
+        api=make_api(hass),
+        options=options,
+        store=store,
+        pellet_store=pellet_store,
+    )
+    coordinator._schedule_refresh = Mock()
+    return coordinator
+
+
+@pytest.fixture
+def coordinator_options():
+    """Return the options of the coordinator fixture, override to change them."""
+    return {}
+
+
+@pytest.fixture
+def coordinator(coordinator_options):
+    return make_coordinator(options=coordinator_options)
@@ -0,0 +1,266 @@
+"""Local stand-in for the Edilkamin cloud, used for offline tests and benchmarks.
+
+It serves the sign in and the token refresh grant, device_info and
+mqtt_command, with a configurable latency and error rate, and simulates the
+stoves: commands change their state, and each device_info read moves them
+one step forward (ignition, heating up, shutdown...).
+
+It can also be run on its own, for load tests of a development instance:
+
+    python -m tests.fake_edilkamin_cloud --port 8080 --latency 0.3
+
+and then set the API base URL option to http://localhost:8080/. With a
+custom base URL, the integration also signs in and refreshes its token at
+the cognito path of the fake, which accepts any username and password.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+import json
+import random
+
+from aiohttp import web
+import jwt
+
+TOKEN_SECRET = "fake-edilkamin-cloud"  # noqa: S105
+
+PHASE_OFF = 0
+PHASE_IGNITION = 1
+PHASE_ON = 2
+PHASE_SHUTDOWN = 3
+# Reads a stove stays in a transition phase
+TRANSITION_READS = 3
+
+# Stove attribute set by each command
+COMMAND_ATTRIBUTES = {
+    "enviroment_1_temperature": "target_temperature",
+    "auto_mode": "is_auto",
+    "power_level": "manual_power",
+    "relax_mode": "relax",
+    "chrono_mode": "chrono",
+    "standby_mode": "standby",
+}
+
+
+@dataclass
+class FakeStove:
+    """State of a simulated stove."""
+
+    mac_address: str
+    power: bool = False
+    phase: int = PHASE_OFF
+    temperature: float = 18.0
+    target_temperature: float = 21.0
+    fans: dict[int, int] = field(default_factory=lambda: {1: 3, 2: 1})
+    is_auto: bool = False
+    manual_power: int = 3
+    relax: bool = False
+    airkare: bool = False
+    chrono: bool = False
+    standby: bool = False
+    power_ons: int = 0
+    alarms: list[dict] = field(default_factory=list)
+    _phase_reads: int = 0
+
+    def apply(self, name: str, value) -> None:
+        """Apply a command."""
+        if name == "power":
+            if bool(value) and not self.power:
+                self.power_ons += 1
+            self.power = bool(value)
+        elif name == "airkare_function":
+            self.airkare = bool(value)
+        elif name.startswith("fan_") and name.endswith("_speed"):
+            self.fans[int(name.split("_")[1])] = value
+        elif name in COMMAND_ATTRIBUTES:
+            setattr(self, COMMAND_ATTRIBUTES[name], value)
+        elif name != "check":
+            raise KeyError(name)
+
+    def step(self) -> None:
+        """Move the simulation one read forward."""
+        self._phase_reads += 1
+        if self.power and self.phase in (PHASE_OFF, PHASE_SHUTDOWN):
+            self.phase, self._phase_reads = PHASE_IGNITION, 0
+        elif not self.power and self.phase in (PHASE_IGNITION, PHASE_ON):
+            self.phase, self._phase_reads = PHASE_SHUTDOWN, 0
+        elif self._phase_reads >= TRANSITION_READS:
+            if self.phase == PHASE_IGNITION:
+                self.phase = PHASE_ON
+            elif self.phase == PHASE_SHUTDOWN:
+                self.phase = PHASE_OFF
+
+        if self.phase == PHASE_ON and self.temperature < self.target_temperature:
+            self.temperature = round(self.temperature + 0.1, 1)
+        elif self.phase == PHASE_OFF and self.temperature > 15:
+            self.temperature = round(self.temperature - 0.1, 1)
+
+    def device_info(self) -> dict:
+        """Return the device information, shaped like the real one."""
+        heating = self.phase == PHASE_ON
+        return {
+            "mac_address": self.mac_address.replace(":", "").lower(),
+            "status": {
+                "commands": {"power": self.power},
+                "temperatures": {"enviroment": self.temperature},
+                "state": {
+                    "operational_phase": self.phase,
+                    "actual_power": self.manual_power if heating else 0,
+                },
+                "flags": {
+                    "is_pellet_in_reserve": False,
+                    "is_airkare_active": self.airkare,
+                    "is_relax_active": self.relax,
+                },
+                "pellet": {"autonomy_time": 900},
+            },
+            "nvm": {
+                "user_parameters": {
+                    "enviroment_1_temperature": self.target_temperature,
+                    "is_auto": self.is_auto,
+                    "manual_power": self.manual_power,
+                    "is_standby_active": self.standby,
+                    "standby_waiting_time": 60,
+                    **{
+                        f"fan_{index}_ventilation": speed
+                        for index, speed in self.fans.items()
+                    },
+                },
+                "installer_parameters": {"fans_number": len(self.fans)},
+                "chrono": {"is_active": self.chrono},
+                "alarms_log": {"index": len(self.alarms), "alarms": self.alarms},
+                "total_counters": {"power_ons": self.power_ons},
+            },
+        }
+
+
+class FakeEdilkaminCloud:
+    """aiohttp application standing in for the Edilkamin cloud."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the cloud.
+
+        latency is the time, in seconds, each request takes; error_rate the
+        share of requests failing with a 503.
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        # All requests fail while the cloud is down
+        self.down = False
+        self.stoves: dict[str, FakeStove] = {}
+        self.requests: Counter[str] = Counter()
+        self._random = random.Random(seed)  # noqa: S311
+        self._refresh_tokens: set[str] = set()
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_post("/cognito", self._initiate_auth)
+        self.app.router.add_get("/device/{mac}/info", self._device_info)
+        self.app.router.add_put("/mqtt/command", self._mqtt_command)
+
+    def add_stove(self, mac_address: str, **state) -> FakeStove:
+        """Add a stove to the cloud."""
+        stove = FakeStove(mac_address, **state)
+        self.stoves[mac_address.replace(":", "").lower()] = stove
+        return stove
+
+    def issue_token(self, lifetime: timedelta = timedelta(hours=1)) -> str:
+        """Return a token the cloud accepts, as a sign in would."""
+        exp = datetime.now(UTC) + lifetime
+        return jwt.encode(
+            {"exp": int(exp.timestamp()), "nonce": self._random.random()},
+            TOKEN_SECRET,
+            algorithm="HS256",
+        )
+
+    def issue_refresh_token(self) -> str:
+        """Return a refresh token the cloud accepts."""
+        refresh_token = f"refresh-{self._random.random()}"
+        self._refresh_tokens.add(refresh_token)
+        return refresh_token
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """Count the request, then add the latency and the errors."""
+        self.requests[request.match_info.route.resource.canonical] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.down or self._random.random() < self.error_rate:
+            return web.Response(status=503, text="Service Unavailable")
+        return await handler(request)
+
+    def _check_token(self, request: web.Request) -> None:
+        """Raise a 401 if the request does not carry a valid token."""
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        try:
+            jwt.decode(token, TOKEN_SECRET, algorithms=["HS256"])
+        except jwt.PyJWTError as err:
+            raise web.HTTPUnauthorized(text="Unauthorized") from err
+
+    async def _initiate_auth(self, request: web.Request) -> web.Response:
+        """Answer the Cognito sign in, with any password, and refresh grant."""
+        body = json.loads(await request.text())
+        flow = body.get("AuthFlow")
+        parameters = body.get("AuthParameters", {})
+        if flow == "USER_PASSWORD_AUTH" and parameters.get("USERNAME"):
+            result = {
+                "IdToken": self.issue_token(),
+                "RefreshToken": self.issue_refresh_token(),
+            }
+        elif (
+            flow == "REFRESH_TOKEN_AUTH"
+            and parameters.get("REFRESH_TOKEN") in self._refresh_tokens
+        ):
+            result = {"IdToken": self.issue_token()}
+        else:
+            return web.json_response({"__type": "NotAuthorizedException"}, status=400)
+        return web.json_response({"AuthenticationResult": result})
+
+    async def _device_info(self, request: web.Request) -> web.Response:
+        """Return the device information of a stove."""
+        self._check_token(request)
+        stove = self.stoves.get(request.match_info["mac"])
+        if stove is None:
+            return web.Response(status=404, text="Not Found")
+        stove.step()
+        return web.json_response(stove.device_info())
+
+    async def _mqtt_command(self, request: web.Request) -> web.Response:
+        """Apply a command to a stove."""
+        self._check_token(request)
+        body = await request.json()
+        stove = self.stoves.get(body.get("mac_address"))
+        if stove is None:
+            return web.Response(status=404, text="Not Found")
+        try:
+            stove.apply(body["name"], body["value"])
+        except KeyError:
+            return web.Response(status=400, text="Unknown command")
+        return web.json_response("Command 00000000 executed successfully")
+
+
+def main() -> None:
+    """Run the fake cloud with a stove."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--mac-address", default="00:11:22:33:44:55")
+    args = parser.parse_args()
+
+    cloud = FakeEdilkaminCloud(latency=args.latency, error_rate=args.error_rate)
+    cloud.add_stove(args.mac_address)
+    web.run_app(cloud.app, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
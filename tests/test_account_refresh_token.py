@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.edilkamin.api.cognito import CognitoTokens
+from custom_components.edilkamin.api.edilkamin_account import EdilkaminAccount
+from tests.conftest import DummyHass
+
+
+def fake_sign_in(*_args, **_kwargs):
+    return CognitoTokens("new_token.jwt")
+
+
+@pytest.mark.asyncio
+@patch("custom_components.edilkamin.api.edilkamin_account.cognito.sign_in",
+       side_effect=fake_sign_in)
+async def test_refresh_token_none(mock_sign_in):
+    account = EdilkaminAccount(DummyHass(), "user", "pass")
+    account._token = None
+    token = await account.get_token()
+    assert token == "new_token.jwt"  # noqa: S105
+    assert account._token == "new_token.jwt"  # noqa: S105
+    mock_sign_in.assert_called_once_with("user", "pass")
+
+
+@pytest.mark.asyncio
+@patch("custom_components.edilkamin.api.edilkamin_account.cognito.sign_in",
+       side_effect=fake_sign_in)
+@patch("custom_components.edilkamin.api.edilkamin_account.is_token_expired",
+       return_value=True)
+async def test_refresh_token_expired(mock_is_expired, mock_sign_in):
+    account = EdilkaminAccount(DummyHass(), "user", "pass")
+    account._token = "expired.jwt"  # noqa: S105
+    token = await account.get_token()
+    assert token == "new_token.jwt"  # noqa: S105
+    assert account._token == "new_token.jwt"  # noqa: S105
+    mock_sign_in.assert_called_once_with("user", "pass")
+    # Checked again once the sign in lock is held
+    mock_is_expired.assert_called_with("expired.jwt")
+
+
+@pytest.mark.asyncio
+@patch("custom_components.edilkamin.api.edilkamin_account.cognito.sign_in",
+       side_effect=fake_sign_in)
+@patch("custom_components.edilkamin.api.edilkamin_account.is_token_expired",
+       return_value=False)
+async def test_refresh_token_valid(mock_is_expired, mock_sign_in):
+    account = EdilkaminAccount(DummyHass(), "user", "pass")
+    account._token = "valid.jwt"  # noqa: S105
+    token = await account.get_token()
+    assert token == "valid.jwt"  # noqa: S105
+    assert account._token == "valid.jwt"  # noqa: S105
+    mock_sign_in.assert_not_called()
+    mock_is_expired.assert_called_once_with("valid.jwt")
@@ -0,0 +1,55 @@
+"""Tests for stoves sharing the same Edilkamin account."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.edilkamin.api.cognito import CognitoTokens
+from custom_components.edilkamin.api.edilkamin_account import EdilkaminAccount
+from tests.conftest import DummyHass, make_api, make_token
+
+
+class FakeClient:
+    cognito_url = None
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+
+    async def device_info(self, _token, mac_address):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return {"mac_address": mac_address}
+
+
+@pytest.fixture
+def account():
+    return EdilkaminAccount(DummyHass(), "user", "pass", client=FakeClient())
+
+
+@pytest.mark.asyncio
+async def test_stoves_share_one_sign_in(account):
+    apis = [make_api(DummyHass(), f"mac{i}", account) for i in range(3)]
+    with patch(
+        "custom_components.edilkamin.api.edilkamin_account.cognito.sign_in",
+        return_value=CognitoTokens(make_token()),
+    ) as mock_sign_in:
+        infos = await asyncio.gather(*(api.get_info() for api in apis))
+
+    mock_sign_in.assert_called_once_with("user", "pass")
+    assert [info["mac_address"] for info in infos] == ["mac0", "mac1", "mac2"]
+
+
+@pytest.mark.asyncio
+async def test_fetches_are_serialized(account):
+    apis = [make_api(DummyHass(), f"mac{i}", account) for i in range(3)]
+    with patch(
+        "custom_components.edilkamin.api.edilkamin_account.cognito.sign_in",
+        return_value=CognitoTokens(make_token()),
+    ):
+        await asyncio.gather(*(api.get_info() for api in apis))
+
+    assert account.client.max_running == 1
@@ -0,0 +1,173 @@
+"""Tests for the renewal of the token with the refresh token."""
+
+from datetime import UTC, datetime, timedelta
+import json
+from unittest.mock import Mock, patch
+
+from aiohttp import web
+import pytest
+
+from custom_components.edilkamin.api import cognito
+from custom_components.edilkamin.api.cognito import CognitoTokens
+from custom_components.edilkamin.api.edilkamin_account import (
+    MIN_RENEWAL_DELAY,
+    TOKEN_RENEWAL_LEAD,
+    EdilkaminAccount,
+)
+from custom_components.edilkamin.api.exceptions import HttpError
+from tests.conftest import DummyHass, make_token
+
+ACCOUNT = "custom_components.edilkamin.api.edilkamin_account"
+
+
+@pytest.fixture
+def account():
+    account = EdilkaminAccount(
+        DummyHass(), "user", "pass", client=Mock(cognito_url=None)
+    )
+    account._token = make_token(-10)
+    account._refresh_token = "refresh"  # noqa: S105
+    return account
+
+
+@pytest.mark.asyncio
+async def test_expired_token_is_refreshed(account):
+    new_token = make_token(3600)
+    with (
+        patch(f"{ACCOUNT}.cognito.async_refresh", return_value=new_token) as refresh,
+        patch(f"{ACCOUNT}.cognito.sign_in") as sign_in,
+    ):
+        assert await account.get_token() == new_token
+
+    refresh.assert_awaited_once_with(
+        account.client.session, "refresh", cognito.COGNITO_URL
+    )
+    sign_in.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_falls_back_to_sign_in(account):
+    new_token = make_token(3600)
+    with (
+        patch(
+            f"{ACCOUNT}.cognito.async_refresh",
+            side_effect=HttpError("refresh failed", "NotAuthorizedException", 400),
+        ),
+        patch(
+            f"{ACCOUNT}.cognito.sign_in",
+            return_value=CognitoTokens(new_token, "new_refresh"),
+        ) as sign_in,
+    ):
+        assert await account.get_token() == new_token
+
+    sign_in.assert_called_once_with("user", "pass")
+    assert account._refresh_token == "new_refresh"  # noqa: S105
+
+
+@pytest.mark.asyncio
+async def test_renewal_is_scheduled_before_expiry(account):
+    account._token = make_token(3600)
+    with patch(f"{ACCOUNT}.async_call_later") as call_later:
+        account.enable_renewal()
+
+    delay = call_later.call_args.args[1]
+    expected = timedelta(seconds=3600) - TOKEN_RENEWAL_LEAD
+    assert abs(delay - expected.total_seconds()) < 5
+
+    # The scheduled renewal refreshes the token while it is still valid
+    new_token = make_token(7200)
+    with (
+        patch(f"{ACCOUNT}.cognito.async_refresh", return_value=new_token),
+        patch(f"{ACCOUNT}.async_call_later") as call_later,
+    ):
+        await account._async_renew_ahead(datetime.now(UTC))
+
+    assert account._token == new_token
+    # And plans the renewal of the new token
+    call_later.assert_called_once()
+
+    unsub = call_later.return_value
+    account.disable_renewal()
+    unsub.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_renewal_ahead_keeps_the_token(account):
+    token = make_token(200)
+    account._token = token
+    account._refresh_token = None
+    with patch(f"{ACCOUNT}.cognito.sign_in", side_effect=OSError):
+        await account._async_renew_ahead(datetime.now(UTC))
+
+    assert account._token == token
+
+
+@pytest.mark.asyncio
+async def test_cognito_refresh(aiohttp_server, aiohttp_client):
+    bodies = []
+
+    async def initiate_auth(request):
+        assert request.headers["X-Amz-Target"].endswith("InitiateAuth")
+        bodies.append(json.loads(await request.text()))
+        return web.json_response({"AuthenticationResult": {"IdToken": "id"}})
+
+    app = web.Application()
+    app.router.add_post("/", initiate_auth)
+    server = await aiohttp_server(app)
+    client = await aiohttp_client(server)
+
+    token = await cognito.async_refresh(
+        client.session, "refresh", url=str(server.make_url("/"))
+    )
+
+    assert token == "id"  # noqa: S105
+    assert bodies[0]["AuthFlow"] == "REFRESH_TOKEN_AUTH"
+    assert bodies[0]["AuthParameters"] == {"REFRESH_TOKEN": "refresh"}
+
+
+def test_sign_in_returns_the_refresh_token():
+    with patch.object(cognito, "Cognito") as cognito_class:
+        user = cognito_class.return_value
+        user.id_token = "id"  # noqa: S105
+        user.refresh_token = "refresh"  # noqa: S105
+        tokens = cognito.sign_in("user", "pass")
+
+    user.authenticate.assert_called_once_with("pass")
+    assert tokens == CognitoTokens("id", "refresh")
+
+
+@pytest.mark.asyncio
+async def test_short_lived_token_is_not_renewed_in_a_loop(account):
+    # Shorter lived than the renewal lead
+    account._token = make_token(60)
+    with patch(f"{ACCOUNT}.async_call_later") as call_later:
+        account.enable_renewal()
+
+    assert call_later.call_args.args[1] == MIN_RENEWAL_DELAY
+
+
+@pytest.mark.asyncio
+async def test_failed_renewal_ahead_is_retried_with_backoff(account):
+    account._token = make_token(3600)
+    account._refresh_token = None
+    account._renew_ahead = True
+    with (
+        patch(f"{ACCOUNT}.cognito.sign_in", side_effect=OSError),
+        patch(f"{ACCOUNT}.async_call_later") as call_later,
+    ):
+        await account._async_renew_ahead(datetime.now(UTC))
+        await account._async_renew_ahead(datetime.now(UTC))
+
+    delays = [call.args[1] for call in call_later.call_args_list]
+    assert delays == [2 * MIN_RENEWAL_DELAY, 4 * MIN_RENEWAL_DELAY]
+
+    # A successful renewal resets the backoff
+    with (
+        patch(
+            f"{ACCOUNT}.cognito.sign_in",
+            return_value=CognitoTokens(make_token(3600)),
+        ),
+        patch(f"{ACCOUNT}.async_call_later"),
+    ):
+        await account._async_renew_ahead(datetime.now(UTC))
+    assert account._renewal_failures == 0
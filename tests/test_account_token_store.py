@@ -0,0 +1,120 @@
+"""Tests for the token saved across restarts."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from custom_components.edilkamin.api.cognito import CognitoTokens
+from custom_components.edilkamin.api.edilkamin_account import EdilkaminAccount
+from custom_components.edilkamin.api.exceptions import HttpError
+from tests.conftest import DummyHass, make_token
+
+SIGN_IN = "custom_components.edilkamin.api.edilkamin_account.cognito.sign_in"
+
+
+def make_account(stored, client=None):
+    store = Mock()
+    store.async_load = AsyncMock(return_value=stored)
+    store.async_remove = AsyncMock()
+    account = EdilkaminAccount(DummyHass(), "user", "pass", client=client, store=store)
+    return account, store
+
+
+def unauthorized():
+    return HttpError("device_info failed", "Unauthorized", 401)
+
+
+@pytest.mark.asyncio
+async def test_valid_stored_token_is_reused():
+    token = make_token(3600)
+    account, _ = make_account({"token": token})
+
+    await account.async_load_token()
+    with patch(
+        "custom_components.edilkamin.api.edilkamin_account.cognito.sign_in"
+    ) as mock_sign_in:
+        assert await account.get_token() == token
+
+    mock_sign_in.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_expired_stored_token_is_ignored():
+    account, store = make_account({"token": make_token(-10)})
+    new_token = make_token(3600)
+
+    await account.async_load_token()
+    with patch(
+        "custom_components.edilkamin.api.edilkamin_account.cognito.sign_in",
+        return_value=CognitoTokens(new_token),
+    ) as mock_sign_in:
+        assert await account.get_token() == new_token
+
+    mock_sign_in.assert_called_once()
+    data_func = store.async_delay_save.call_args.args[0]
+    assert data_func() == {"token": new_token, "refresh_token": None}
+
+
+@pytest.mark.asyncio
+async def test_nothing_stored():
+    account, _ = make_account(None)
+
+    await account.async_load_token()
+
+    assert account._token is None
+
+
+@pytest.mark.asyncio
+async def test_rejected_token_is_dropped_and_renewed():
+    revoked = make_token(3600)
+    new_token = make_token(3600)
+    client = Mock(cognito_url=None)
+    client.device_info = AsyncMock(side_effect=[unauthorized(), {"mac": "mac"}])
+    account, store = make_account(
+        {"token": revoked, "refresh_token": "refresh"}, client
+    )
+    await account.async_load_token()
+
+    with patch(SIGN_IN, return_value=CognitoTokens(new_token)) as mock_sign_in:
+        assert await account.device_info("mac") == {"mac": "mac"}
+
+    store.async_remove.assert_awaited_once()
+    # The refresh token of the rejected session is not used
+    mock_sign_in.assert_called_once()
+    assert [call.args[0] for call in client.device_info.await_args_list] == [
+        revoked,
+        new_token,
+    ]
+    assert account._token == new_token
+
+
+@pytest.mark.asyncio
+async def test_request_is_retried_once():
+    client = Mock(cognito_url=None)
+    client.mqtt_command = AsyncMock(side_effect=unauthorized())
+    account, _ = make_account({"token": make_token(3600)}, client)
+    await account.async_load_token()
+
+    with (
+        patch(SIGN_IN, return_value=CognitoTokens(make_token(3600))),
+        pytest.raises(HttpError),
+    ):
+        await account.mqtt_command("mac", {"name": "power", "value": 1})
+
+    assert client.mqtt_command.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_other_errors_keep_the_token():
+    token = make_token(3600)
+    client = Mock(cognito_url=None)
+    client.device_info = AsyncMock(side_effect=HttpError("failed", "Error", 500))
+    account, store = make_account({"token": token}, client)
+    await account.async_load_token()
+
+    with pytest.raises(HttpError):
+        await account.device_info("mac")
+
+    client.device_info.assert_awaited_once()
+    store.async_remove.assert_not_awaited()
+    assert account._token == token
@@ -0,0 +1,59 @@
+"""Tests for the token cache of EdilkaminAsyncApi."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.edilkamin.api.cognito import CognitoTokens
+from custom_components.edilkamin.api.edilkamin_async_api import EdilkaminAsyncApi
+from tests.conftest import DummyHass, make_token
+
+
+@pytest.fixture
+def api():
+    return EdilkaminAsyncApi(
+        mac_address="mac",
+        username="user",
+        password="pass",  # noqa: S106
+        hass=DummyHass(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_token_is_cached(api):
+    with patch(
+        "custom_components.edilkamin.api.edilkamin_account.cognito.sign_in",
+        return_value=CognitoTokens(make_token(3600)),
+    ) as mock_sign_in:
+        first = await api.get_token()
+        second = await api.get_token()
+
+    assert first == second
+    mock_sign_in.assert_called_once_with("user", "pass")
+
+
+@pytest.mark.asyncio
+async def test_get_token_signs_in_again_when_expired(api):
+    api.account._token = make_token(-10)
+    new_token = make_token(3600)
+    with patch(
+        "custom_components.edilkamin.api.edilkamin_account.cognito.sign_in",
+        return_value=CognitoTokens(new_token),
+    ) as mock_sign_in:
+        token = await api.get_token()
+
+    assert token == new_token
+    mock_sign_in.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_token_single_flight(api):
+    with patch(
+        "custom_components.edilkamin.api.edilkamin_account.cognito.sign_in",
+        return_value=CognitoTokens(make_token(3600)),
+    ) as mock_sign_in:
+        tokens = await asyncio.gather(*(api.get_token() for _ in range(5)))
+
+    assert len(set(tokens)) == 1
+    mock_sign_in.assert_called_once()
@@ -0,0 +1,115 @@
+"""Tests for the configuration check binary sensor."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+from homeassistant.core import State
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.util import dt as dt_util
+import pytest
+
+from custom_components.edilkamin.api.exceptions import CircuitOpenError
+from custom_components.edilkamin.binary_sensor import EdilkaminCheckBinarySensor
+
+BINARY_SENSOR = "custom_components.edilkamin.binary_sensor"
+
+
+@pytest.fixture
+def sensor():
+    api = Mock()
+    api.get_mac_address.return_value = "00:11:22:33:44:55"
+    api.check = AsyncMock()
+    sensor = EdilkaminCheckBinarySensor(api, check_interval=360)
+    sensor.async_write_ha_state = Mock()
+    return sensor
+
+
+def test_not_polled(sensor):
+    assert sensor.should_poll is False
+
+
+@pytest.mark.asyncio
+async def test_successful_check(sensor):
+    await sensor.async_check()
+
+    assert sensor.is_on is False
+    assert sensor.extra_state_attributes["last_check"] is not None
+    sensor.async_write_ha_state.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_check(sensor):
+    sensor._api.check.side_effect = RuntimeError
+
+    await sensor.async_check()
+
+    assert sensor.is_on is True
+    sensor.async_write_ha_state.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_check_skipped_while_the_cloud_is_down(sensor):
+    sensor._api.check.side_effect = CircuitOpenError(30)
+
+    await sensor.async_check()
+
+    assert sensor.is_on is None
+    assert sensor.extra_state_attributes["last_check"] is None
+    sensor.async_write_ha_state.assert_not_called()
+
+
+def test_check_due(sensor):
+    now = dt_util.utcnow()
+    assert sensor.is_check_due(now)
+
+    sensor._last_check = now - timedelta(minutes=10)
+    assert not sensor.is_check_due(now)
+
+    sensor._last_check = now - timedelta(minutes=360)
+    assert sensor.is_check_due(now)
+
+
+def test_check_never_due_when_disabled(sensor):
+    sensor._check_interval = 0
+
+    assert not sensor.is_check_due(dt_util.utcnow())
+
+
+@pytest.mark.asyncio
+async def test_missed_check_runs_when_added(sensor):
+    sensor.hass = Mock()
+    sensor.hass.async_create_background_task.side_effect = lambda coro, _name: (
+        coro.close()
+    )
+    last_state = State(
+        "binary_sensor.check_configuration",
+        "off",
+        {"last_check": (dt_util.utcnow() - timedelta(days=1)).isoformat()},
+    )
+    with (
+        patch.object(RestoreEntity, "async_added_to_hass"),
+        patch.object(sensor, "async_get_last_state", return_value=last_state),
+        patch(f"{BINARY_SENSOR}.async_track_time_interval"),
+    ):
+        await sensor.async_added_to_hass()
+
+    assert sensor.is_on is False
+    sensor.hass.async_create_background_task.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_recent_check_is_not_repeated_when_added(sensor):
+    sensor.hass = Mock()
+    last_state = State(
+        "binary_sensor.check_configuration",
+        "off",
+        {"last_check": dt_util.utcnow().isoformat()},
+    )
+    with (
+        patch.object(RestoreEntity, "async_added_to_hass"),
+        patch.object(sensor, "async_get_last_state", return_value=last_state),
+        patch(f"{BINARY_SENSOR}.async_track_time_interval"),
+    ):
+        await sensor.async_added_to_hass()
+
+    sensor.hass.async_create_background_task.assert_not_called()
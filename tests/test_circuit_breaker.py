@@ -0,0 +1,133 @@
+"""Tests for the circuit breaker of the API."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+import pytest
+
+from custom_components.edilkamin.api.circuit_breaker import (
+    CircuitBreaker,
+    CircuitState,
+)
+from custom_components.edilkamin.api.exceptions import CircuitOpenError, HttpError
+
+MONOTONIC = "custom_components.edilkamin.api.circuit_breaker.monotonic"
+
+
+def make_breaker():
+    return CircuitBreaker("test", failure_threshold=2, base_delay=10, max_delay=60)
+
+
+async def fail(breaker, err=None):
+    with pytest.raises((aiohttp.ClientError, HttpError, ValueError)):
+        await breaker.async_call(
+            AsyncMock(side_effect=err or aiohttp.ClientConnectionError())
+        )
+
+
+@pytest.mark.asyncio
+async def test_opens_after_consecutive_failures():
+    breaker = make_breaker()
+    request = AsyncMock(return_value="ok")
+
+    await fail(breaker)
+    assert breaker.state is CircuitState.CLOSED
+    await fail(breaker)
+    assert breaker.state is CircuitState.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        await breaker.async_call(request)
+    request.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_request_errors_do_not_open_the_circuit():
+    breaker = make_breaker()
+
+    for _ in range(3):
+        await fail(breaker, HttpError("bad request", "unknown command", 400))
+
+    assert breaker.state is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_request_errors_do_not_reset_the_failures():
+    breaker = make_breaker()
+
+    await fail(breaker)
+    await fail(breaker, ValueError("invalid json"))
+    assert breaker.failures == 1
+    await fail(breaker)
+
+    assert breaker.state is CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_request_error_on_the_probe_opens_the_circuit_again():
+    breaker = make_breaker()
+    with patch(MONOTONIC, return_value=100):
+        await fail(breaker)
+        await fail(breaker)
+
+    with patch(MONOTONIC, return_value=200):
+        await fail(breaker, ValueError("invalid json"))
+
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.failures == 2
+    # As long as before, give or take the jitter
+    assert 8 <= breaker._open_until - 200 <= 12
+
+
+@pytest.mark.asyncio
+async def test_successful_probe_closes_the_circuit():
+    breaker = make_breaker()
+    with patch(MONOTONIC, return_value=100):
+        await fail(breaker)
+        await fail(breaker)
+
+    with patch(MONOTONIC, return_value=200):
+        assert await breaker.async_call(AsyncMock(return_value="ok")) == "ok"
+
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_doubles_the_delay():
+    breaker = make_breaker()
+    with patch(MONOTONIC, return_value=100):
+        await fail(breaker)
+        await fail(breaker)
+    first_delay = breaker._open_until - 100
+
+    with patch(MONOTONIC, return_value=200):
+        await fail(breaker)
+    second_delay = breaker._open_until - 200
+
+    assert breaker.state is CircuitState.OPEN
+    # Twice as long, give or take the jitter
+    assert 8 <= first_delay <= 12
+    assert 16 <= second_delay <= 24
+
+
+@pytest.mark.asyncio
+async def test_single_probe_while_half_open():
+    breaker = make_breaker()
+    with patch(MONOTONIC, return_value=100):
+        await fail(breaker)
+        await fail(breaker)
+
+    async def slow_request():
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    with patch(MONOTONIC, return_value=200):
+        probe = asyncio.create_task(breaker.async_call(slow_request))
+        await asyncio.sleep(0)
+        assert breaker.state is CircuitState.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            await breaker.async_call(slow_request)
+        assert await probe == "ok"
+
+    assert breaker.state is CircuitState.CLOSED
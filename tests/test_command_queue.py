@@ -0,0 +1,114 @@
+"""Tests for the command queue of the Edilkamin API."""
+
+import asyncio
+
+import pytest
+
+from custom_components.edilkamin.api.command_queue import CommandQueue
+from tests.conftest import DummyHass
+
+
+class FakeSender:
+    def __init__(self):
+        self.sent = []
+
+    async def __call__(self, payload):
+        await asyncio.sleep(0)
+        if payload["name"] == "broken":
+            msg = "command failed"
+            raise RuntimeError(msg)
+        self.sent.append(payload)
+        return f"Command {payload['name']} executed successfully"
+
+
+@pytest.fixture
+def sender():
+    return FakeSender()
+
+
+@pytest.fixture
+def queue(sender):
+    return CommandQueue(DummyHass(), sender, "test", window=0.01)
+
+
+@pytest.mark.asyncio
+async def test_commands_are_sent_in_order(queue, sender):
+    results = await asyncio.gather(
+        queue.async_put({"name": "auto_mode", "value": False}),
+        queue.async_put({"name": "power_level", "value": 3}),
+    )
+
+    assert sender.sent == [
+        {"name": "auto_mode", "value": False},
+        {"name": "power_level", "value": 3},
+    ]
+    assert results == [
+        "Command auto_mode executed successfully",
+        "Command power_level executed successfully",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_repeated_writes_are_merged(queue, sender):
+    await asyncio.gather(
+        queue.async_put({"name": "fan_1_speed", "value": 1}),
+        queue.async_put({"name": "relax_mode", "value": True}),
+        queue.async_put({"name": "fan_1_speed", "value": 2}),
+        queue.async_put({"name": "fan_1_speed", "value": 5}),
+    )
+
+    # Last value wins, and the merged command moves after the other one
+    assert sender.sent == [
+        {"name": "relax_mode", "value": True},
+        {"name": "fan_1_speed", "value": 5},
+    ]
+    assert queue.stats.queued == 4
+    assert queue.stats.merged == 2
+    assert queue.stats.sent == 2
+    assert queue.stats.average_latency is not None
+    assert queue.depth == 0
+
+
+@pytest.mark.asyncio
+async def test_failure_only_affects_its_command(queue, sender):
+    results = await asyncio.gather(
+        queue.async_put({"name": "broken", "value": 1}),
+        queue.async_put({"name": "power", "value": 1}),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], RuntimeError)
+    assert sender.sent == [{"name": "power", "value": 1}]
+    assert queue.stats.failed == 1
+
+
+@pytest.mark.asyncio
+async def test_commands_queued_while_sending_are_sent(queue, sender):
+    first = asyncio.ensure_future(queue.async_put({"name": "power", "value": 1}))
+    await asyncio.sleep(0.02)
+    await queue.async_put({"name": "power", "value": 0})
+    await first
+
+    assert sender.sent == [
+        {"name": "power", "value": 1},
+        {"name": "power", "value": 0},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_flush_cancels_the_command_being_sent():
+    sending = asyncio.Event()
+
+    async def send(_payload):
+        sending.set()
+        await asyncio.Event().wait()
+
+    queue = CommandQueue(DummyHass(), send, "test", window=0.01)
+    caller = asyncio.ensure_future(queue.async_put({"name": "power", "value": 1}))
+    await sending.wait()
+
+    queue._flush_task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(caller, timeout=1)
+    assert queue.depth == 0
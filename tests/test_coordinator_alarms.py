@@ -0,0 +1,62 @@
+"""Tests for the incremental processing of the alarm log."""
+
+from custom_components.edilkamin.const import EVENT_ALARM
+from custom_components.edilkamin.coordinator import RECENT_ALARMS
+
+
+def alarm_log(count):
+    alarms = [{"type": i, "timestamp": 1700000000 + i} for i in range(count)]
+    return {"nvm": {"alarms_log": {"index": count, "alarms": alarms}}}
+
+
+def fired_types(coordinator):
+    calls = coordinator.hass.bus.async_fire.call_args_list
+    return [call.args[1]["type"] for call in calls if call.args[0] == EVENT_ALARM]
+
+
+def test_history_does_not_fire_events(coordinator):
+    coordinator._set_device_info(alarm_log(25))
+
+    assert fired_types(coordinator) == []
+    recent = coordinator.get_recent_alarms()
+    assert len(recent) == RECENT_ALARMS
+    assert [alarm["type"] for alarm in recent] == list(range(15, 25))
+
+
+def test_new_alarms_fire_events(coordinator):
+    coordinator._set_device_info(alarm_log(3))
+
+    coordinator._set_device_info(alarm_log(5))
+
+    assert fired_types(coordinator) == [3, 4]
+    event = coordinator.hass.bus.async_fire.call_args.args[1]
+    assert event["mac_address"] == "00:11:22:33:44:55"
+    assert event["index"] == 4
+    assert [alarm["type"] for alarm in coordinator.get_recent_alarms()] == [
+        0,
+        1,
+        2,
+        3,
+        4,
+    ]
+
+
+def test_unchanged_log_is_not_processed_again(coordinator):
+    coordinator._set_device_info(alarm_log(3))
+    recent = coordinator.get_recent_alarms()
+
+    coordinator._set_device_info(
+        {**alarm_log(3), "status": {"temperatures": {"enviroment": 20}}}
+    )
+
+    assert coordinator.get_recent_alarms() is recent
+    assert fired_types(coordinator) == []
+
+
+def test_reset_log_is_history(coordinator):
+    coordinator._set_device_info(alarm_log(5))
+
+    coordinator._set_device_info(alarm_log(1))
+
+    assert fired_types(coordinator) == []
+    assert len(coordinator.get_recent_alarms()) == 1
@@ -0,0 +1,91 @@
+"""Tests for the per field change detection of the coordinator."""
+
+from unittest.mock import Mock
+
+from custom_components.edilkamin.snapshot import (
+    PATH_POWER,
+    PATH_TEMPERATURE,
+    changed_paths,
+    flatten_device_info,
+)
+
+
+def device_info(temperature, power):
+    return {
+        "status": {
+            "temperatures": {"enviroment": temperature},
+            "commands": {"power": power},
+        }
+    }
+
+
+def test_flatten_device_info():
+    assert flatten_device_info({"a": {"b": 1, "c": {}}, "d": [1, 2]}) == {
+        ("a", "b"): 1,
+        ("a", "c"): {},
+        ("d",): [1, 2],
+    }
+
+
+def test_changed_paths_include_parents():
+    old = flatten_device_info(device_info(20, power=True))
+    new = flatten_device_info(device_info(21, power=True))
+
+    assert changed_paths(old, new) == {
+        ("status",),
+        ("status", "temperatures"),
+        PATH_TEMPERATURE,
+    }
+
+
+def test_changed_paths_detect_removed_fields():
+    old = flatten_device_info({"a": {"b": None}})
+    assert changed_paths(old, {}) == {("a",), ("a", "b")}
+
+
+def test_only_listeners_of_changed_fields_are_updated(coordinator):
+    temperature_listener = Mock()
+    power_listener = Mock()
+    global_listener = Mock()
+    coordinator.async_add_listener(temperature_listener, frozenset({PATH_TEMPERATURE}))
+    coordinator.async_add_listener(power_listener, frozenset({PATH_POWER}))
+    coordinator.async_add_listener(global_listener)
+
+    # First data goes to every listener
+    coordinator._set_device_info(device_info(20, power=True))
+    coordinator.async_update_listeners()
+    assert temperature_listener.call_count == 1
+    assert power_listener.call_count == 1
+
+    # Nothing changed
+    coordinator._set_device_info(device_info(20, power=True))
+    coordinator.async_update_listeners()
+    assert temperature_listener.call_count == 1
+    assert power_listener.call_count == 1
+
+    coordinator._set_device_info(device_info(21, power=True))
+    coordinator.async_update_listeners()
+    assert temperature_listener.call_count == 2
+    assert power_listener.call_count == 1
+    assert global_listener.call_count == 3
+
+
+def test_availability_change_updates_every_listener(coordinator):
+    listener = Mock()
+    coordinator.async_add_listener(listener, frozenset({PATH_TEMPERATURE}))
+    coordinator._set_device_info(device_info(20, power=True))
+    coordinator.async_update_listeners()
+
+    coordinator.last_update_success = False
+    coordinator.async_update_listeners()
+
+    assert listener.call_count == 2
+
+
+def test_new_listener_gets_current_data(coordinator):
+    coordinator.data = device_info(20, power=True)
+    listener = Mock()
+
+    coordinator.async_add_listener(listener, frozenset({PATH_TEMPERATURE}))
+
+    listener.assert_called_once()
@@ -0,0 +1,62 @@
+"""Tests for the optimistic update of the coordinator after a command."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from custom_components.edilkamin.coordinator import optimistic_update
+
+
+@pytest.mark.parametrize(
+    ("payload", "expected"),
+    [
+        ({"name": "power", "value": 1}, {"status": {"commands": {"power": True}}}),
+        (
+            {"name": "fan_2_speed", "value": 3},
+            {"nvm": {"user_parameters": {"fan_2_ventilation": 3}}},
+        ),
+        (
+            {"name": "auto_mode", "value": False},
+            {"nvm": {"user_parameters": {"is_auto": False}}},
+        ),
+        ({"name": "check", "value": False}, None),
+    ],
+)
+def test_optimistic_update(payload, expected):
+    assert optimistic_update(payload) == expected
+
+
+def test_handle_command_updates_state_and_requests_refresh(coordinator):
+    coordinator._device_info = {
+        "nvm": {"user_parameters": {"is_auto": True, "manual_power": 1}}
+    }
+    listener = Mock()
+    coordinator.async_add_listener(listener)
+
+    coordinator.async_handle_command({"name": "auto_mode", "value": False})
+    coordinator.async_handle_command({"name": "power_level", "value": 3})
+
+    assert coordinator.is_auto() is False
+    assert coordinator.get_manual_power() == 3
+    assert coordinator.data == coordinator._device_info
+    assert listener.call_count == 2
+    assert coordinator.hass.async_create_task.call_count == 2
+
+
+def test_handle_command_without_state(coordinator):
+    listener = Mock()
+    coordinator.async_add_listener(listener)
+
+    coordinator.async_handle_command({"name": "unknown", "value": 1})
+
+    listener.assert_not_called()
+    coordinator.hass.async_create_task.assert_called_once()
+
+
+def test_passive_command_is_ignored(coordinator):
+    interval = coordinator.update_interval
+
+    coordinator.async_handle_command({"name": "check", "value": False})
+
+    assert coordinator.update_interval == interval
+    coordinator.hass.async_create_task.assert_not_called()
@@ -0,0 +1,76 @@
+"""Tests for the adaptive polling interval of the coordinator."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from custom_components.edilkamin.const import (
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_IDLE_SCAN_INTERVAL,
+    CONF_SCAN_INTERVAL,
+)
+from custom_components.edilkamin.coordinator import COMMAND_FAST_POLL_DURATION
+
+FAST = timedelta(seconds=5)
+NORMAL = timedelta(seconds=20)
+IDLE = timedelta(seconds=300)
+
+
+@pytest.fixture
+def coordinator_options():
+    return {
+        CONF_FAST_SCAN_INTERVAL: 5,
+        CONF_SCAN_INTERVAL: 20,
+        CONF_IDLE_SCAN_INTERVAL: 300,
+    }
+
+
+def device_info(phase, power):
+    return {
+        "status": {"state": {"operational_phase": phase}, "commands": {"power": power}}
+    }
+
+
+@pytest.mark.parametrize(
+    ("phase", "power", "expected"),
+    [
+        (0, False, IDLE),
+        (0, True, NORMAL),
+        (1, True, FAST),
+        (2, True, NORMAL),
+        (3, False, FAST),
+        (5, True, NORMAL),
+        (6, True, FAST),
+        (None, None, NORMAL),
+    ],
+)
+def test_interval_follows_operational_phase(coordinator, phase, power, expected):
+    coordinator._device_info = device_info(phase, power)
+    assert coordinator._compute_update_interval() == expected
+
+
+def test_interval_is_fast_after_command(coordinator):
+    coordinator._device_info = device_info(0, power=False)
+
+    with patch(
+        "custom_components.edilkamin.coordinator.monotonic", return_value=1000.0
+    ):
+        coordinator.async_handle_command({"name": "relax_mode", "value": True})
+        assert coordinator.update_interval == FAST
+        assert coordinator._compute_update_interval() == FAST
+
+    with patch(
+        "custom_components.edilkamin.coordinator.monotonic",
+        return_value=1000.0 + COMMAND_FAST_POLL_DURATION,
+    ):
+        assert coordinator._compute_update_interval() == IDLE
+
+
+@pytest.mark.asyncio
+async def test_update_sets_interval(coordinator):
+    coordinator.update_device_information = AsyncMock(
+        return_value=device_info(0, power=False)
+    )
+    await coordinator._async_update_data()
+    assert coordinator.update_interval == IDLE
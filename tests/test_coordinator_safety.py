@@ -1,30 +1,5 @@
 """Tests for coordinator data safety checks."""
 
-from unittest.mock import AsyncMock, Mock
-
-import pytest
-
-from custom_components.edilkamin.coordinator import EdilkaminCoordinator
-
-
-@pytest.fixture
-def mock_hass():
-    """Create a mock hass instance."""
-    hass = Mock()
-    hass.async_add_executor_job = AsyncMock()
-    return hass
-
-
-@pytest.fixture
-def coordinator(mock_hass):
-    """Create a coordinator instance."""
-    return EdilkaminCoordinator(
-        hass=mock_hass,
-        username="test@example.com",
-        password="password",  # noqa: S106
-        mac_address="00:11:22:33:44:55",
-    )
-
 
 class TestCoordinatorWithNoData:
     """Test coordinator methods when device_info is empty."""
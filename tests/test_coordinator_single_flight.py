@@ -0,0 +1,60 @@
+"""Tests for the single-flight device fetch of the coordinator."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+
+def slow_get_info(results):
+    async def get_info():
+        await asyncio.sleep(0.01)
+        return results.pop(0)
+
+    return AsyncMock(side_effect=get_info)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_fetch(coordinator):
+    coordinator.api.get_info = slow_get_info([{"fetch": 1}, {"fetch": 2}])
+
+    results = await asyncio.gather(
+        *(coordinator.update_device_information() for _ in range(5))
+    )
+
+    assert results == [{"fetch": 1}] * 5
+    coordinator.api.get_info.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_next_caller_starts_a_new_fetch(coordinator):
+    coordinator.api.get_info = slow_get_info([{"fetch": 1}, {"fetch": 2}])
+
+    assert await coordinator.update_device_information() == {"fetch": 1}
+    assert await coordinator.update_device_information() == {"fetch": 2}
+
+
+@pytest.mark.asyncio
+async def test_error_is_shared(coordinator):
+    coordinator.api.get_info = AsyncMock(side_effect=RuntimeError("cloud down"))
+
+    results = await asyncio.gather(
+        coordinator.update_device_information(),
+        coordinator.update_device_information(),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    coordinator.api.get_info.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_fetch(coordinator):
+    coordinator.api.get_info = slow_get_info([{"fetch": 1}])
+
+    first = asyncio.ensure_future(coordinator.update_device_information())
+    second = asyncio.ensure_future(coordinator.update_device_information())
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == {"fetch": 1}
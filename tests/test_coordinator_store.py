@@ -0,0 +1,58 @@
+"""Tests for the stored device information of the coordinator."""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from custom_components.edilkamin.coordinator import STORE_SAVE_DELAY
+from tests.conftest import make_coordinator
+
+STORED = {
+    "status": {"temperatures": {"enviroment": 19}},
+    "nvm": {"installer_parameters": {"fans_number": 3}},
+}
+
+
+def make_stored_coordinator(stored):
+    store = Mock()
+    store.async_load = AsyncMock(return_value=stored)
+    return make_coordinator(store=store), store
+
+
+@pytest.mark.asyncio
+async def test_load_stored_seeds_the_coordinator():
+    coordinator, _ = make_stored_coordinator(STORED)
+
+    assert await coordinator.async_load_stored()
+
+    assert coordinator.data == STORED
+    assert coordinator.get_nb_fans() == 3
+    assert coordinator.get_temperature() == 19
+    # The stored state is never fresh enough for a precondition check
+    assert coordinator._last_fetch is None
+
+
+@pytest.mark.asyncio
+async def test_load_without_stored_state():
+    coordinator, _ = make_stored_coordinator(None)
+
+    assert not await coordinator.async_load_stored()
+    assert coordinator.data is None
+
+
+@pytest.mark.asyncio
+async def test_fetches_are_saved_once_per_delay():
+    coordinator, store = make_stored_coordinator(None)
+    coordinator.api.get_info = AsyncMock(side_effect=[STORED, {"status": {}}, STORED])
+
+    await coordinator._async_update_data()
+    await coordinator._async_update_data()
+
+    store.async_delay_save.assert_called_once()
+    data_func, delay = store.async_delay_save.call_args.args
+    assert delay == STORE_SAVE_DELAY
+    # The latest device information is written
+    assert data_func() == {"status": {}}
+
+    await coordinator._async_update_data()
+    assert store.async_delay_save.call_count == 2
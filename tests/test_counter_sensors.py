@@ -0,0 +1,84 @@
+"""Tests for the total counter sensors."""
+
+from unittest.mock import Mock
+
+from homeassistant.components.sensor import SensorStateClass
+
+from custom_components.edilkamin.sensor import (
+    COUNTER_DESCRIPTIONS,
+    EdilkaminSensor,
+    counter_description,
+)
+
+
+def device_info(power_ons=42, p1_working_time=100, temperature=20):
+    return {
+        "status": {"temperatures": {"enviroment": temperature}},
+        "nvm": {
+            "total_counters": {
+                "power_ons": power_ons,
+                "p1_working_time": p1_working_time,
+                "flame_outs": 3,
+                "is_reset": False,
+            }
+        },
+    }
+
+
+def add_sensor(coordinator, key):
+    sensor = EdilkaminSensor(coordinator, COUNTER_DESCRIPTIONS[key])
+    sensor.async_write_ha_state = Mock()
+    coordinator.async_add_listener(
+        sensor._handle_coordinator_update, sensor.coordinator_context
+    )
+    return sensor
+
+
+def test_counters_of_the_payload(coordinator):
+    coordinator._set_device_info(device_info())
+
+    # Booleans are not counters
+    assert coordinator.get_counters() == {
+        "power_ons": 42,
+        "p1_working_time": 100,
+        "flame_outs": 3,
+    }
+
+
+def test_descriptions_of_counters():
+    working_time = COUNTER_DESCRIPTIONS["p1_working_time"]
+    assert working_time.native_unit_of_measurement == "h"
+    unknown = counter_description("flame_outs")
+    assert unknown.name == "Flame outs"
+    assert unknown.state_class is SensorStateClass.TOTAL_INCREASING
+    assert all(
+        description.state_class is SensorStateClass.TOTAL_INCREASING
+        for description in COUNTER_DESCRIPTIONS.values()
+    )
+
+
+def test_power_ons_keeps_its_unique_id(coordinator):
+    sensor = EdilkaminSensor(coordinator, COUNTER_DESCRIPTIONS["power_ons"])
+
+    assert sensor.unique_id == "00:11:22:33:44:55_power_ons"
+
+
+def test_counter_only_updated_when_it_changes(coordinator):
+    coordinator._set_device_info(device_info())
+    coordinator.data = coordinator._device_info
+    power_ons = add_sensor(coordinator, "power_ons")
+    working_time = add_sensor(coordinator, "p1_working_time")
+    assert power_ons.native_value == 42
+    assert working_time.native_value == 100
+    coordinator.async_update_listeners()
+    power_ons.async_write_ha_state.reset_mock()
+    working_time.async_write_ha_state.reset_mock()
+
+    coordinator._set_device_info(device_info(temperature=21))
+    coordinator.async_update_listeners()
+    coordinator._set_device_info(device_info(power_ons=43, temperature=21))
+    coordinator.async_update_listeners()
+
+    assert power_ons.native_value == 43
+    power_ons.async_write_ha_state.assert_called_once()
+    working_time.async_write_ha_state.assert_not_called()
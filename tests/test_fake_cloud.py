@@ -0,0 +1,143 @@
+"""Tests running the API and the coordinator against the fake Edilkamin cloud."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+import aiohttp
+import pytest
+import pytest_asyncio
+
+from custom_components.edilkamin import async_get_account
+from custom_components.edilkamin.api import cognito
+from custom_components.edilkamin.api.circuit_breaker import CircuitState
+from custom_components.edilkamin.api.edilkamin_account import EdilkaminAccount
+from custom_components.edilkamin.api.edilkamin_async_api import (
+    CircuitOpenError,
+    EdilkaminAsyncApi,
+    HttpError,
+)
+from custom_components.edilkamin.api.edilkamin_http_client import EdilkaminHttpClient
+from custom_components.edilkamin.coordinator import EdilkaminCoordinator
+from tests.conftest import MAC_ADDRESS, DummyHass
+from tests.fake_edilkamin_cloud import PHASE_IGNITION, PHASE_ON, FakeEdilkaminCloud
+
+INTEGRATION = "custom_components.edilkamin"
+ACCOUNT = "custom_components.edilkamin.api.edilkamin_account"
+
+
+@pytest.fixture
+def cloud():
+    cloud = FakeEdilkaminCloud(seed=0)
+    cloud.add_stove(MAC_ADDRESS)
+    return cloud
+
+
+@pytest_asyncio.fixture
+async def server(aiohttp_server, cloud):
+    return await aiohttp_server(cloud.app)
+
+
+@pytest_asyncio.fixture
+async def api(server, cloud):
+    async with aiohttp.ClientSession() as session:
+        hass = DummyHass()
+        account = EdilkaminAccount(
+            hass,
+            "user",
+            "pass",
+            client=EdilkaminHttpClient(session, base_url=str(server.make_url("/"))),
+        )
+        account._token = cloud.issue_token()
+        yield EdilkaminAsyncApi(MAC_ADDRESS, "user", "pass", hass, account=account)
+
+
+@pytest.fixture
+def coordinator(api):
+    hass = Mock()
+    hass.async_create_task = Mock(side_effect=lambda coro: coro.close())
+    coordinator = EdilkaminCoordinator(hass, api)
+    coordinator._schedule_refresh = Mock()
+    return coordinator
+
+
+@pytest.mark.asyncio
+async def test_poll_and_command(cloud, api, coordinator):
+    await coordinator._async_update_data()
+    assert coordinator.get_power_status() is False
+    assert coordinator.get_nb_fans() == 2
+
+    await api.enable_power()
+    await coordinator._async_update_data()
+
+    assert coordinator.get_power_status() is True
+    assert coordinator.get_operational_phase() == PHASE_IGNITION
+    assert cloud.stoves["001122334455"].power_ons == 1
+
+    for _ in range(3):
+        await coordinator._async_update_data()
+    assert coordinator.get_operational_phase() == PHASE_ON
+
+
+@pytest.mark.asyncio
+async def test_outage_opens_the_circuit(cloud, api):
+    cloud.down = True
+    for _ in range(3):
+        with pytest.raises(HttpError):
+            await api.get_info()
+
+    assert api.circuit_breaker.state is CircuitState.OPEN
+    requests = sum(cloud.requests.values())
+    with pytest.raises(CircuitOpenError):
+        await api.get_info()
+    # Held back without reaching the cloud
+    assert sum(cloud.requests.values()) == requests
+
+
+@pytest.mark.asyncio
+async def test_latency(cloud, api):
+    cloud.latency = 0.05
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    await api.get_info()
+
+    assert loop.time() - start >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_refresh_grant(cloud, server):
+    refresh_token = cloud.issue_refresh_token()
+    async with aiohttp.ClientSession() as session:
+        url = str(server.make_url("/cognito"))
+        token = await cognito.async_refresh(session, refresh_token, url=url)
+
+    assert token
+
+
+@pytest.mark.asyncio
+async def test_base_url_option_end_to_end(cloud, server):
+    """An entry pointed at the fake cloud signs in and polls without Cognito."""
+    hass = DummyHass()
+    hass.data = {}
+    async with aiohttp.ClientSession() as session:
+        with (
+            patch(f"{INTEGRATION}.async_get_clientsession", return_value=session),
+            patch(f"{INTEGRATION}.get_token_store", return_value=None),
+            patch(f"{ACCOUNT}.async_call_later"),
+            patch(f"{ACCOUNT}.cognito.sign_in", side_effect=AssertionError),
+        ):
+            account = await async_get_account(
+                hass, "user", "pass", str(server.make_url("/"))
+            )
+            api = EdilkaminAsyncApi(MAC_ADDRESS, "user", "pass", hass, account=account)
+            info = await api.get_info()
+            await api.enable_power()
+
+            # The token expired, it is refreshed at the fake cloud too
+            account._token = cloud.issue_token(timedelta(seconds=-10))
+            await api.get_info()
+
+    assert info["mac_address"] == "001122334455"
+    assert cloud.stoves["001122334455"].power
+    assert cloud.requests["/cognito"] == 2
@@ -0,0 +1,71 @@
+"""Tests for the aiohttp based Edilkamin client."""
+
+import logging
+
+import aiohttp
+from aiohttp import web
+import pytest
+import pytest_asyncio
+
+from custom_components.edilkamin.api.edilkamin_http_client import EdilkaminHttpClient
+from custom_components.edilkamin.api.exceptions import HttpError
+
+
+@pytest_asyncio.fixture
+async def server(aiohttp_server):
+    """Start a minimal stand-in for the Edilkamin cloud."""
+    requests = []
+
+    async def device_info(request):
+        requests.append(request)
+        return web.json_response({"status": {"temperatures": {"enviroment": 21}}})
+
+    async def mqtt_command(request):
+        requests.append(request)
+        body = await request.json()
+        if body["name"] == "unknown":
+            return web.Response(status=400, text="unknown command")
+        return web.json_response("Command 0001 executed successfully")
+
+    app = web.Application()
+    app.router.add_get("/device/{mac}/info", device_info)
+    app.router.add_put("/mqtt/command", mqtt_command)
+    srv = await aiohttp_server(app)
+    srv.requests = requests
+    return srv
+
+
+@pytest_asyncio.fixture
+async def client(server):
+    async with aiohttp.ClientSession() as session:
+        yield EdilkaminHttpClient(session, base_url=str(server.make_url("/")))
+
+
+@pytest.mark.asyncio
+async def test_device_info(server, client):
+    info = await client.device_info("token", "AA:BB:CC:DD:EE:FF")
+
+    assert info == {"status": {"temperatures": {"enviroment": 21}}}
+    request = server.requests[0]
+    assert request.match_info["mac"] == "aabbccddeeff"
+    assert request.headers["Authorization"] == "Bearer token"
+
+
+@pytest.mark.asyncio
+async def test_mqtt_command(client):
+    result = await client.mqtt_command(
+        "token", "AA:BB:CC:DD:EE:FF", {"name": "power", "value": 1}
+    )
+
+    assert result == "Command 0001 executed successfully"
+
+
+@pytest.mark.asyncio
+async def test_mqtt_command_error(client, caplog):
+    caplog.set_level(logging.DEBUG)
+    with pytest.raises(HttpError) as err:
+        await client.mqtt_command("token", "mac", {"name": "unknown", "value": 1})
+
+    assert err.value.status_code == 400
+    assert err.value.text == "unknown command"
+    assert "PUT mqtt/command failed with status 400: unknown command" in caplog.text
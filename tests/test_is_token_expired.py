@@ -0,0 +1,22 @@
+import jwt
+
+from custom_components.edilkamin.api.edilkamin_account import is_token_expired
+from tests.conftest import make_token
+
+
+def test_is_token_expired_expired():
+    expired_token = make_token(-10)  # Expired token since 10s
+    assert is_token_expired(expired_token) is True
+
+def test_is_token_expired_valid():
+    valid_token = make_token(3600)  # Expires in 1h
+    assert is_token_expired(valid_token) is False
+
+def test_is_token_expired_no_exp():
+    # Token without exp field
+    token = jwt.encode({}, key="secret", algorithm="HS256")
+    assert is_token_expired(token) is True
+
+def test_is_token_expired_invalid():
+    # Undecodable token
+    assert is_token_expired("not.a.jwt") is True
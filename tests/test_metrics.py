@@ -0,0 +1,121 @@
+"""Tests for the metrics of the calls to the cloud."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from custom_components.edilkamin.api.edilkamin_async_api import (
+    EdilkaminAsyncApi,
+    HttpError,
+)
+from custom_components.edilkamin.api.metrics import CallMetrics, Metrics
+from custom_components.edilkamin.coordinator import EdilkaminCoordinator
+from custom_components.edilkamin.diagnostics import async_get_config_entry_diagnostics
+from custom_components.edilkamin.sensor import EdilkaminCallLatencySensor
+from tests.conftest import DummyHass
+
+
+@pytest.fixture
+def api():
+    api = EdilkaminAsyncApi(
+        mac_address="00:11:22:33:44:55",
+        username="user",
+        password="pass",  # noqa: S106
+        hass=DummyHass(),
+    )
+    api.account.device_info = AsyncMock(return_value={"mac_address": "001122334455"})
+    api.account.mqtt_command = AsyncMock(return_value="ok")
+    return api
+
+
+def test_call_metrics():
+    metrics = CallMetrics()
+
+    metrics.record(0.05)
+    metrics.record(0.3)
+    metrics.record(20, error=True)
+
+    assert metrics.calls == 3
+    assert metrics.errors == 1
+    assert metrics.error_rate == pytest.approx(1 / 3)
+    assert metrics.max_latency == 20
+    assert metrics.as_dict()["histogram"] == {
+        "<=0.1s": 1,
+        "<=0.25s": 0,
+        "<=0.5s": 1,
+        "<=1.0s": 0,
+        "<=2.5s": 0,
+        "<=5.0s": 0,
+        "<=10.0s": 0,
+        ">10.0s": 1,
+    }
+
+
+def test_measure_failed_call():
+    metrics = Metrics()
+
+    with pytest.raises(RuntimeError), metrics.measure("call"):
+        raise RuntimeError
+
+    assert metrics.get("call").errors == 1
+
+
+@pytest.mark.asyncio
+async def test_api_requests_are_measured(api):
+    await api.get_info()
+    api._command_queue._window = 0
+    await api.enable_power()
+    api.account.device_info.side_effect = HttpError("failed", "", 500)
+    with pytest.raises(HttpError):
+        await api.get_info()
+
+    assert api.metrics.get("device_info").calls == 2
+    assert api.metrics.get("device_info").errors == 1
+    assert api.metrics.get("mqtt_command").calls == 1
+
+
+@pytest.mark.asyncio
+async def test_sign_in_is_measured(api):
+    with patch(
+        "custom_components.edilkamin.api.edilkamin_account.cognito.sign_in",
+        side_effect=RuntimeError,
+    ):
+        assert not await api.authenticate()
+
+    assert api.account.metrics.get("sign_in").errors == 1
+
+
+@pytest.mark.asyncio
+async def test_latency_sensor(api):
+    coordinator = EdilkaminCoordinator(Mock(), api)
+    api.metrics.get("device_info").record(0.25)
+    sensor = EdilkaminCallLatencySensor(coordinator, api.metrics, "device_info")
+    sensor.async_write_ha_state = Mock()
+
+    sensor._handle_coordinator_update()
+
+    assert sensor.native_value == 250
+    assert sensor.entity_registry_enabled_default is False
+
+
+@pytest.mark.asyncio
+async def test_diagnostics(api):
+    coordinator = EdilkaminCoordinator(Mock(), api)
+    coordinator._schedule_refresh = Mock()
+    await coordinator._async_update_data()
+    coordinator.data = coordinator._device_info
+    hass = Mock()
+    hass.data = {"edilkamin": {"entry": {"api": api, "coordinator": coordinator}}}
+    entry = Mock(
+        entry_id="entry",
+        data={"mac_address": "00:11:22:33:44:55", "username": "u", "password": "p"},
+        options={},
+    )
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["data"]["password"] == "**REDACTED**"  # noqa: S105
+    assert diagnostics["device_info"]["mac_address"] == "**REDACTED**"
+    assert diagnostics["metrics"]["api"]["device_info"]["calls"] == 1
+    assert diagnostics["metrics"]["coordinator"]["update"]["calls"] == 1
+    assert diagnostics["circuit_breaker"]["state"] == "closed"
@@ -0,0 +1,39 @@
+"""Tests for the options flow."""
+
+from unittest.mock import Mock
+
+from homeassistant.data_entry_flow import FlowResultType
+import pytest
+
+from custom_components.edilkamin.config_flow import EdilkaminOptionsFlow
+from custom_components.edilkamin.const import CONF_BASE_URL, CONF_SCAN_INTERVAL
+
+FAKE_CLOUD = "http://localhost:8080/"
+
+
+def make_flow(options, *, advanced):
+    flow = EdilkaminOptionsFlow()
+    flow.hass = Mock()
+    flow.hass.config_entries.async_get_known_entry.return_value = Mock(options=options)
+    flow.handler = "entry"
+    flow.context = {"show_advanced_options": advanced}
+    return flow
+
+
+@pytest.mark.asyncio
+async def test_base_url_kept_without_advanced_mode():
+    flow = make_flow({CONF_BASE_URL: FAKE_CLOUD}, advanced=False)
+
+    result = await flow.async_step_init({CONF_SCAN_INTERVAL: 30})
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"] == {CONF_SCAN_INTERVAL: 30, CONF_BASE_URL: FAKE_CLOUD}
+
+
+@pytest.mark.asyncio
+async def test_base_url_cleared_in_advanced_mode():
+    flow = make_flow({CONF_BASE_URL: FAKE_CLOUD}, advanced=True)
+
+    result = await flow.async_step_init({CONF_SCAN_INTERVAL: 30})
+
+    assert result["data"] == {CONF_SCAN_INTERVAL: 30}
@@ -0,0 +1,158 @@
+"""Tests for the pellet consumption estimation."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from custom_components.edilkamin.const import (
+    CONF_PELLET_CONSUMPTION,
+    DEFAULT_PELLET_CONSUMPTION,
+    EVENT_PELLET_REFILL,
+)
+from custom_components.edilkamin.pellet import PelletEstimator
+from custom_components.edilkamin.snapshot import EdilkaminSnapshot
+from tests.conftest import make_coordinator
+
+
+def sample(*, phase=2, power=3, autonomy=36000, in_reserve=False):
+    return EdilkaminSnapshot(
+        operational_phase=phase,
+        actual_power=power,
+        autonomy_time=autonomy,
+        pellet_in_reserve=in_reserve,
+    )
+
+
+def test_consumption_converges_to_the_burn_rate():
+    estimator = PelletEstimator()
+    for minute in range(3 * 24 * 60):
+        estimator.add_sample(minute * 60, sample())
+
+    assert estimator.consumption == pytest.approx(
+        DEFAULT_PELLET_CONSUMPTION[3], rel=0.1
+    )
+    assert estimator.pellet_left == pytest.approx(10 * DEFAULT_PELLET_CONSUMPTION[3])
+    assert estimator.predicted_empty() is not None
+
+
+def test_idle_time_lowers_the_average():
+    estimator = PelletEstimator()
+    for minute in range(3 * 24 * 60):
+        # Running half of the time
+        phase = 2 if minute % 120 < 60 else 0
+        estimator.add_sample(minute * 60, sample(phase=phase))
+
+    assert estimator.consumption == pytest.approx(
+        DEFAULT_PELLET_CONSUMPTION[3] / 2, rel=0.1
+    )
+
+
+def test_long_gap_is_not_averaged():
+    estimator = PelletEstimator()
+    estimator.add_sample(0, sample())
+    estimator.add_sample(60, sample(phase=0))
+
+    estimator.add_sample(10 * 3600, sample(phase=0))
+
+    assert estimator.consumption == DEFAULT_PELLET_CONSUMPTION[3]
+
+
+def test_refill_from_autonomy():
+    estimator = PelletEstimator()
+    estimator.add_sample(0, sample(autonomy=1800))
+
+    added = estimator.add_sample(60, sample(autonomy=1800 + 7200))
+
+    assert added == pytest.approx(2 * DEFAULT_PELLET_CONSUMPTION[3])
+    assert estimator.add_sample(120, sample(autonomy=1800 + 7140)) is None
+
+
+def test_power_change_is_not_a_refill():
+    estimator = PelletEstimator()
+    # 15 kg left, in a stove burning less at power 1 and more at power 5 than
+    # the default consumption
+    real = {1: 0.6, 5: 2.3}
+    estimator.add_sample(0, sample(power=5, autonomy=round(15 / real[5] * 3600)))
+
+    added = estimator.add_sample(
+        60, sample(power=1, autonomy=round(15 / real[1] * 3600))
+    )
+
+    assert added is None
+    # A refill at the new power level is still detected
+    added = estimator.add_sample(
+        120, sample(power=1, autonomy=round(20 / real[1] * 3600))
+    )
+    assert added == pytest.approx(5 * 0.8 / real[1], abs=0.1)
+
+
+def test_refill_across_a_power_change_from_reserve():
+    estimator = PelletEstimator()
+    estimator.add_sample(0, sample(power=5, autonomy=600, in_reserve=True))
+
+    assert estimator.add_sample(60, sample(power=1, autonomy=36000)) == 0.0
+
+
+def test_consumption_of_the_stove():
+    estimator = PelletEstimator()
+    consumption = {3: 2.0}
+    estimator.add_sample(0, sample(autonomy=7200), consumption)
+    estimator.add_sample(60, sample(autonomy=7200), consumption)
+
+    assert estimator.consumption == 2.0
+    assert estimator.pellet_left == pytest.approx(4.0)
+
+
+def test_refill_from_reserve():
+    estimator = PelletEstimator()
+    estimator.add_sample(0, sample(autonomy=None, in_reserve=True))
+
+    assert estimator.add_sample(60, sample(autonomy=None)) == 0.0
+
+
+def test_state_round_trip():
+    estimator = PelletEstimator()
+    estimator.add_sample(0, sample())
+    estimator.add_sample(60, sample())
+
+    assert PelletEstimator.from_dict(estimator.as_dict()) == estimator
+
+
+@pytest.mark.asyncio
+async def test_coordinator_fires_refill_event():
+    coordinator = make_coordinator()
+    hass = coordinator.hass
+
+    def info(autonomy):
+        return {
+            "status": {
+                "state": {"operational_phase": 2, "actual_power": 3},
+                "pellet": {"autonomy_time": autonomy},
+            }
+        }
+
+    coordinator.api.get_info = AsyncMock(side_effect=[info(600), info(20000)])
+    await coordinator._async_update_data()
+    await coordinator._async_update_data()
+
+    hass.bus.async_fire.assert_called_once()
+    event, data = hass.bus.async_fire.call_args.args
+    assert event == EVENT_PELLET_REFILL
+    assert data["added"] > 0
+
+
+@pytest.mark.asyncio
+async def test_coordinator_uses_the_consumption_option():
+    coordinator = make_coordinator(options={CONF_PELLET_CONSUMPTION[3]: 2.0})
+    coordinator.api.get_info = AsyncMock(
+        return_value={
+            "status": {
+                "state": {"operational_phase": 2, "actual_power": 3},
+                "pellet": {"autonomy_time": 7200},
+            }
+        }
+    )
+
+    await coordinator._async_update_data()
+
+    assert coordinator.get_pellet_left() == pytest.approx(4.0)
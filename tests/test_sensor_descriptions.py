@@ -0,0 +1,105 @@
+"""Tests for the sensors described by their field of the device information."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from custom_components.edilkamin.const import DATA_COORDINATOR, DOMAIN
+from custom_components.edilkamin.sensor import (
+    SENSOR_DESCRIPTIONS,
+    EdilkaminSensor,
+    async_setup_entry,
+)
+from tests.conftest import MAC_ADDRESS
+
+
+def device_info(phase=2, autonomy=5430, nb_fans=2):
+    return {
+        "status": {
+            "temperatures": {"enviroment": 20.5},
+            "state": {"actual_power": 3, "operational_phase": phase},
+            "pellet": {"autonomy_time": autonomy},
+        },
+        "nvm": {
+            "user_parameters": {"fan_1_ventilation": 2, "fan_2_ventilation": 4},
+            "installer_parameters": {"fans_number": nb_fans},
+            "alarms_log": {
+                "index": 1,
+                "alarms": [{"type": 3, "timestamp": 0}],
+            },
+            "total_counters": {"power_ons": 42, "p1_working_time": 100},
+        },
+    }
+
+
+@pytest.fixture
+def coordinator(coordinator):
+    coordinator._set_device_info(device_info())
+    coordinator.data = coordinator._device_info
+    return coordinator
+
+
+def sensor(coordinator, key):
+    description = next(d for d in SENSOR_DESCRIPTIONS if d.key == key)
+    entity = EdilkaminSensor(coordinator, description)
+    entity.async_write_ha_state = Mock()
+    entity._handle_coordinator_update()
+    return entity
+
+
+@pytest.mark.asyncio
+async def test_setup_keeps_the_unique_ids(coordinator):
+    hass = Mock()
+    hass.data = {DOMAIN: {"entry": {DATA_COORDINATOR: coordinator}}}
+    entry = Mock(entry_id="entry")
+    add_entities = Mock()
+
+    await async_setup_entry(hass, entry, add_entities)
+
+    unique_ids = {entity.unique_id for entity in add_entities.call_args.args[0]}
+    assert {
+        f"{MAC_ADDRESS}_{suffix}"
+        for suffix in (
+            "temperature",
+            "fan1_sensor",
+            "fan2_sensor",
+            "nb_alarms_sensor",
+            "actual_power",
+            "operational_phase_sensor",
+            "autonomy",
+            "power_ons",
+            "p1_working_time",
+            "pellet_consumption",
+            "pellet_empty",
+        )
+    } <= unique_ids
+
+
+def test_value_of_the_field(coordinator):
+    assert sensor(coordinator, "temperature").native_value == 20.5
+    assert sensor(coordinator, "actual_power").native_value == 3
+
+
+def test_autonomy_in_minutes(coordinator):
+    autonomy = sensor(coordinator, "autonomy")
+
+    assert autonomy.native_value == 90
+    assert autonomy.native_unit_of_measurement == "min"
+
+
+def test_operational_phase(coordinator):
+    phase = sensor(coordinator, "operational_phase_sensor")
+    assert phase.native_value == "On"
+    assert phase.extra_state_attributes == {"value": 2}
+
+    coordinator._set_device_info(device_info(phase=42))
+    phase._handle_coordinator_update()
+    assert phase.native_value == "Unknown"
+    assert phase.extra_state_attributes == {"value": 42}
+
+
+def test_alarms(coordinator):
+    alarms = sensor(coordinator, "nb_alarms_sensor")
+
+    assert alarms.native_value == 1
+    assert [error["type"] for error in alarms.extra_state_attributes["errors"]] == [3]
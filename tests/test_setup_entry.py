@@ -0,0 +1,140 @@
+"""Tests for the set up and unload of the config entries."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+from edilkamin import constants
+import pytest
+
+from custom_components.edilkamin import (
+    async_setup_entry,
+    async_unload_entry,
+    get_token_store,
+)
+from custom_components.edilkamin.const import (
+    CONF_BASE_URL,
+    DATA_ACCOUNTS,
+    DATA_API,
+    DATA_COORDINATOR,
+    DOMAIN,
+    MAC_ADDRESS,
+    PASSWORD,
+    USERNAME,
+)
+
+INTEGRATION = "custom_components.edilkamin"
+
+
+@pytest.fixture
+def hass():
+    hass = Mock()
+    hass.data = {}
+    hass.config_entries.async_forward_entry_setups = AsyncMock()
+    hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
+    return hass
+
+
+@pytest.fixture(autouse=True)
+def integration():
+    def make_account(_hass, username, password, client, store):
+        return Mock(
+            username=username,
+            password=password,
+            client=client,
+            store=store,
+            async_load_token=AsyncMock(),
+        )
+
+    def make_coordinator(*_args, **_kwargs):
+        return Mock(
+            async_load_stored=AsyncMock(return_value=False), async_refresh=AsyncMock()
+        )
+
+    with (
+        patch(f"{INTEGRATION}.async_get_clientsession"),
+        patch(f"{INTEGRATION}.get_store"),
+        patch(f"{INTEGRATION}.get_token_store"),
+        patch(f"{INTEGRATION}.register_device"),
+        patch(f"{INTEGRATION}.EdilkaminStatistics"),
+        patch(f"{INTEGRATION}.EdilkaminAccount", side_effect=make_account),
+        patch(f"{INTEGRATION}.EdilkaminCoordinator", side_effect=make_coordinator),
+    ):
+        yield
+
+
+def make_entry(entry_id, mac_address, password="pass", base_url=None):  # noqa: S107
+    return Mock(
+        entry_id=entry_id,
+        data={MAC_ADDRESS: mac_address, USERNAME: "user", PASSWORD: password},
+        options={CONF_BASE_URL: base_url} if base_url else {},
+    )
+
+
+@pytest.mark.asyncio
+async def test_setup_stores_the_data_of_each_entry(hass):
+    first = make_entry("first", "00:11:22:33:44:55")
+    second = make_entry("second", "66:77:88:99:aa:bb")
+
+    assert await async_setup_entry(hass, first)
+    assert await async_setup_entry(hass, second)
+
+    data = hass.data[DOMAIN]
+    assert data.keys() == {"first", "second"}
+    assert data["first"][DATA_API].get_mac_address() == "00:11:22:33:44:55"
+    assert data["second"][DATA_API].get_mac_address() == "66:77:88:99:aa:bb"
+    assert data["first"][DATA_COORDINATOR] is not data["second"][DATA_COORDINATOR]
+    # Both stoves of the account share it
+    account = data["first"][DATA_API].account
+    assert data["second"][DATA_API].account is account
+    assert hass.data[DATA_ACCOUNTS] == {"user": account}
+    account.enable_renewal.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_unload_forgets_the_account_with_its_last_entry(hass):
+    first = make_entry("first", "00:11:22:33:44:55")
+    second = make_entry("second", "66:77:88:99:aa:bb")
+    await async_setup_entry(hass, first)
+    await async_setup_entry(hass, second)
+    account = hass.data[DOMAIN]["first"][DATA_API].account
+
+    assert await async_unload_entry(hass, first)
+    assert hass.data[DATA_ACCOUNTS] == {"user": account}
+    account.disable_renewal.assert_not_called()
+
+    assert await async_unload_entry(hass, second)
+    assert hass.data[DOMAIN] == {}
+    assert hass.data[DATA_ACCOUNTS] == {}
+    account.disable_renewal.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_account_replaced_while_used_keeps_renewing(hass):
+    first = make_entry("first", "00:11:22:33:44:55")
+    second = make_entry("second", "66:77:88:99:aa:bb", password="new")  # noqa: S106
+    await async_setup_entry(hass, first)
+    await async_setup_entry(hass, second)
+    old = hass.data[DOMAIN]["first"][DATA_API].account
+    new = hass.data[DOMAIN]["second"][DATA_API].account
+
+    assert new is not old
+    old.disable_renewal.assert_not_called()
+    assert hass.data[DATA_ACCOUNTS] == {"user": new}
+
+    # The first entry is the last one using the old account
+    await async_unload_entry(hass, first)
+    old.disable_renewal.assert_called_once()
+    assert hass.data[DATA_ACCOUNTS] == {"user": new}
+    new.disable_renewal.assert_not_called()
+
+
+def test_token_store_of_each_api():
+    hass = Mock(data={})
+    hass.config.config_dir = "/config"
+
+    official = get_token_store(hass, "user")
+    fake = get_token_store(hass, "user", "http://localhost:8080/")
+
+    # The store of the official cloud keeps the key of the previous versions
+    assert official.key == "edilkamin.token.04f8996da763b7a9"
+    assert fake.key != official.key
+    assert get_token_store(hass, "user", constants.NEW_API_URL).key == official.key
@@ -0,0 +1,55 @@
+"""Tests for the device information snapshot."""
+
+import logging
+
+from custom_components.edilkamin.snapshot import EdilkaminSnapshot
+
+DEVICE_INFO = {
+    "status": {
+        "temperatures": {"enviroment": 21.5},
+        "commands": {"power": True},
+        "state": {"operational_phase": 2, "actual_power": 3},
+    },
+    "nvm": {
+        "user_parameters": {
+            "fan_1_ventilation": 3,
+            "fan_2_ventilation": 1,
+            "is_auto": True,
+        },
+        "installer_parameters": {"fans_number": 2},
+        "alarms_log": {"index": 1, "alarms": [{"type": 7}, {"type": 8}]},
+    },
+}
+
+
+def test_from_device_info():
+    snapshot = EdilkaminSnapshot.from_device_info(DEVICE_INFO)
+
+    assert snapshot.temperature == 21.5
+    assert snapshot.power is True
+    assert snapshot.operational_phase == 2
+    assert snapshot.fan_speeds == {1: 3, 2: 1}
+    assert snapshot.nb_fans == 2
+    assert snapshot.is_auto is True
+    assert snapshot.alarms == [{"type": 7}]
+    assert snapshot.device_info is DEVICE_INFO
+
+
+def test_defaults_of_empty_device_info():
+    snapshot = EdilkaminSnapshot.from_device_info({})
+
+    assert snapshot.temperature is None
+    assert snapshot.fan_speeds == {}
+    assert snapshot.nb_fans == 0
+    assert snapshot.nb_alarms == 0
+    assert snapshot.alarms == []
+    assert snapshot.standby_active is False
+    assert snapshot.is_auto is False
+
+
+def test_unexpected_section_is_logged(caplog):
+    with caplog.at_level(logging.WARNING):
+        snapshot = EdilkaminSnapshot.from_device_info({"status": [], "nvm": {}})
+
+    assert "status section is a list" in caplog.text
+    assert snapshot.temperature is None
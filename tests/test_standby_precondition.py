@@ -0,0 +1,85 @@
+"""Tests for the auto mode precondition of the standby commands."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from custom_components.edilkamin.api.edilkamin_async_api import NotInRightStateError
+from custom_components.edilkamin.const import CONF_STATE_MAX_AGE
+from custom_components.edilkamin.coordinator import EdilkaminCoordinator
+from tests.conftest import make_api
+
+
+@pytest.fixture
+def api():
+    api = make_api(Mock())
+    api.get_info = AsyncMock()
+    api.execute_command = AsyncMock()
+    return api
+
+
+@pytest.fixture
+def coordinator(api):
+    coordinator = EdilkaminCoordinator(
+        hass=api._hass, api=api, options={CONF_STATE_MAX_AGE: 30}
+    )
+    coordinator.async_refresh = AsyncMock()
+    coordinator._device_info = {"nvm": {"user_parameters": {"is_auto": True}}}
+    return coordinator
+
+
+@pytest.mark.asyncio
+async def test_standby_uses_given_state(api):
+    await api.enable_standby_mode(is_auto=True)
+
+    api.get_info.assert_not_awaited()
+    api.execute_command.assert_awaited_once_with(
+        {"name": "standby_mode", "value": True}
+    )
+
+
+@pytest.mark.asyncio
+async def test_standby_refused_outside_auto_mode(api):
+    with pytest.raises(NotInRightStateError):
+        await api.disable_standby_mode(is_auto=False)
+
+    api.execute_command.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_standby_fetches_state_when_not_given(api):
+    api.get_info.return_value = {"nvm": {"user_parameters": {"is_auto": True}}}
+
+    await api.enable_standby_mode()
+
+    api.get_info.assert_awaited_once()
+    api.execute_command.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_is_auto_uses_fresh_cache(coordinator):
+    with patch(
+        "custom_components.edilkamin.coordinator.monotonic", return_value=1000.0
+    ):
+        coordinator._last_fetch = 980.0
+        assert await coordinator.async_is_auto() is True
+
+    coordinator.async_refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_is_auto_refreshes_stale_cache(coordinator):
+    with patch(
+        "custom_components.edilkamin.coordinator.monotonic", return_value=1000.0
+    ):
+        coordinator._last_fetch = 960.0
+        assert await coordinator.async_is_auto() is True
+
+    coordinator.async_refresh.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_is_auto_refreshes_without_data(coordinator):
+    await coordinator.async_is_auto(max_age=3600)
+
+    coordinator.async_refresh.assert_awaited_once()
@@ -0,0 +1,131 @@
+"""Tests for the hourly long-term statistics."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from custom_components.edilkamin.snapshot import EdilkaminSnapshot
+from custom_components.edilkamin.statistics import (
+    EdilkaminStatistics,
+    TimeWeightedMean,
+)
+
+HOUR = datetime(2025, 1, 1, 10, tzinfo=UTC)
+
+
+def device_info(temperature, power=3, power_ons=42):
+    return {
+        "status": {
+            "temperatures": {"enviroment": temperature},
+            "state": {"actual_power": power},
+        },
+        "nvm": {"total_counters": {"power_ons": power_ons}},
+    }
+
+
+@pytest.fixture
+def coordinator():
+    coordinator = Mock()
+    coordinator.get_mac_address.return_value = "AA:BB:CC:DD:EE:FF"
+    coordinator.snapshot = EdilkaminSnapshot.from_device_info(device_info(20))
+    return coordinator
+
+
+@pytest.fixture
+def hass():
+    hass = Mock()
+    hass.config.components = {"recorder"}
+    return hass
+
+
+@pytest.fixture
+def statistics(hass, coordinator):
+    with patch(
+        "custom_components.edilkamin.statistics.dt_util.utcnow",
+        return_value=HOUR + timedelta(minutes=5),
+    ):
+        return EdilkaminStatistics(hass, coordinator)
+
+
+def test_mean_is_weighted_by_time():
+    mean = TimeWeightedMean()
+    mean.add(HOUR, 20)
+    mean.add(HOUR + timedelta(minutes=45), 24)
+
+    assert mean.close(HOUR + timedelta(hours=1)) == (20, 24, 21)
+    # The last value carries over to the next hour
+    assert mean.close(HOUR + timedelta(hours=2)) == (24, 24, 24)
+
+
+def test_unknown_value_has_no_mean():
+    mean = TimeWeightedMean()
+    mean.add(HOUR, None)
+
+    assert mean.close(HOUR + timedelta(hours=1)) is None
+
+
+def test_import_hourly_aggregates(statistics, coordinator):
+    statistics.add_sample(HOUR)
+    coordinator.snapshot = EdilkaminSnapshot.from_device_info(
+        device_info(22, power=5, power_ons=43)
+    )
+    statistics.add_sample(HOUR + timedelta(minutes=30))
+
+    with patch(
+        "custom_components.edilkamin.statistics.async_add_external_statistics"
+    ) as add_statistics:
+        statistics.async_import(HOUR + timedelta(hours=1))
+
+    imported = {
+        metadata["statistic_id"]: (metadata, data)
+        for _hass, metadata, (data,) in (
+            call.args for call in add_statistics.mock_calls
+        )
+    }
+    # The counters have the statistics of their total increasing sensors
+    assert imported.keys() == {
+        "edilkamin:aa_bb_cc_dd_ee_ff_temperature",
+        "edilkamin:aa_bb_cc_dd_ee_ff_actual_power",
+    }
+    metadata, data = imported["edilkamin:aa_bb_cc_dd_ee_ff_temperature"]
+    assert metadata["source"] == "edilkamin"
+    assert metadata["unit_of_measurement"] == "°C"
+    assert not metadata["has_sum"]
+    assert data == {"start": HOUR, "min": 20, "max": 22, "mean": 21}
+
+
+def test_hour_is_imported_once(statistics):
+    statistics.add_sample(HOUR)
+    with patch(
+        "custom_components.edilkamin.statistics.async_add_external_statistics"
+    ) as add_statistics:
+        statistics.async_import(HOUR + timedelta(hours=1))
+        statistics.async_import(HOUR + timedelta(hours=1))
+
+    assert add_statistics.call_count == 2
+
+
+def test_nothing_imported_without_recorder(statistics, hass):
+    hass.config.components = set()
+    statistics.add_sample(HOUR)
+    with patch(
+        "custom_components.edilkamin.statistics.async_add_external_statistics"
+    ) as add_statistics:
+        statistics.async_import(HOUR + timedelta(hours=1))
+
+    add_statistics.assert_not_called()
+
+
+def test_hour_follows_utc(statistics, hass):
+    with patch(
+        "custom_components.edilkamin.statistics.async_track_utc_time_change"
+    ) as track:
+        stop = statistics.async_start()
+
+    # Hours of half hour timezones do not start at an UTC hour
+    track.assert_called_once_with(
+        hass, statistics._async_hour_changed, minute=0, second=0
+    )
+    stop()
+    track.return_value.assert_called_once()